@@ -0,0 +1,120 @@
+"""Hammer one SKU with concurrent checkouts and verify it never oversells.
+
+Sets the stock of one product variant, fires more single-unit orders at
+POST /orders/create than there are units, then checks that exactly `stock`
+orders succeeded, the rest got 409, and the stock row ended at zero.
+
+    cd src && uvicorn main:app --port 8000 --workers 4
+    cd src && python ../benchmarks/checkout_contention.py --url http://localhost:8000 \
+        --product-id <uuid> --color Red --size 9 --stock 200 --orders 1000 --concurrency 200
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from sqlalchemy import text  # noqa: E402
+
+from db.session import engine  # noqa: E402
+
+
+def set_stock(product_id, color, size, stock):
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO inventory (product_id, color, size, quantity) VALUES (:p, :c, :s, :q) "
+            "ON CONFLICT (product_id, color, size) DO UPDATE SET quantity = EXCLUDED.quantity"
+        ), {"p": product_id, "c": color, "s": size, "q": stock})
+
+
+def read_stock(product_id, color, size):
+    with engine.connect() as conn:
+        return conn.execute(text(
+            "SELECT quantity FROM inventory WHERE product_id = :p AND color = :c AND size = :s"
+        ), {"p": product_id, "c": color, "s": size}).scalar()
+
+
+def order_body(product_id, color, size, n):
+    return json.dumps({
+        "customer": {
+            "firstName": "Load", "lastName": f"Test{n}", "email": f"load{n}@example.com",
+            "phone": "555-0100", "address": "1 Main St", "city": "Austin", "state": "TX",
+            "zipCode": "73301", "country": "US",
+        },
+        "items": [{
+            "productId": product_id, "name": "", "price": 0, "quantity": 1,
+            "color": color, "size": size, "image": "",
+        }],
+        "paymentMethod": "card",
+        "orderDate": datetime.utcnow().isoformat(),
+    }).encode()
+
+
+def checkout(url, body):
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"}, method="POST")
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as error:
+        status = error.code
+    except (urllib.error.URLError, OSError):
+        status = "error"
+    return status, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--product-id", required=True)
+    parser.add_argument("--color", required=True)
+    parser.add_argument("--size", type=float, required=True)
+    parser.add_argument("--stock", type=int, default=100)
+    parser.add_argument("--orders", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    set_stock(args.product_id, args.color, args.size, args.stock)
+    url = args.url.rstrip("/") + "/orders/create"
+    bodies = [order_body(args.product_id, args.color, args.size, n) for n in range(args.orders)]
+
+    statuses = Counter()
+    latencies = []
+    lock = threading.Lock()
+
+    def run(body):
+        status, elapsed = checkout(url, body)
+        with lock:
+            statuses[status] += 1
+            latencies.append(elapsed)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(run, bodies))
+    elapsed = time.perf_counter() - started
+
+    remaining = read_stock(args.product_id, args.color, args.size)
+    latencies.sort()
+    print(f"{args.orders} checkouts in {elapsed:.2f}s: {args.orders / elapsed:.1f} req/s, "
+          f"p50 {latencies[len(latencies) // 2] * 1000:.1f} ms, p99 {latencies[int(len(latencies) * 0.99)] * 1000:.1f} ms")
+    print(f"responses: {dict(statuses)}")
+    print(f"stock: {args.stock} -> {remaining}")
+
+    sold = statuses[200]
+    oversold = sold > args.stock or remaining is None or remaining < 0 or sold != args.stock - remaining
+    print("OVERSOLD or inconsistent" if oversold else "OK: no overselling")
+    sys.exit(1 if oversold else 0)
+
+
+if __name__ == "__main__":
+    main()
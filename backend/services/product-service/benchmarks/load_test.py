@@ -0,0 +1,94 @@
+"""Compare catalog read throughput of the sync and async database modes.
+
+Start the service twice, once per mode, then point this script at both:
+
+    DB_ASYNC=0 uvicorn main:app --port 8000 --workers 1
+    DB_ASYNC=1 uvicorn main:app --port 8001 --workers 1
+    python benchmarks/load_test.py --target sync=http://localhost:8000 \
+        --target async=http://localhost:8001 --concurrency 200 --duration 20
+
+Only the standard library is used so it runs anywhere the service does.
+"""
+
+import argparse
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+# Bounded reads only: an unbounded list such as /orders/ grows with the table and
+# ends up measuring response size rather than the database mode
+DEFAULT_PATHS = ["/products/?limit=50", "/products/?limit=50&sort=price_asc", "/categories/"]
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_target(base_url, paths, concurrency, duration):
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(offset):
+        nonlocal errors
+        local, local_errors, i = [], 0, offset
+        while time.perf_counter() < deadline:
+            url = base_url + paths[i % len(paths)]
+            i += 1
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(url, timeout=30) as response:
+                    response.read()
+                local.append(time.perf_counter() - start)
+            except (urllib.error.URLError, OSError):
+                local_errors += 1
+        with lock:
+            latencies.extend(local)
+            errors += local_errors
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for n in range(concurrency):
+            pool.submit(worker, n)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50": percentile(latencies, 50) * 1000,
+        "p95": percentile(latencies, 95) * 1000,
+        "p99": percentile(latencies, 99) * 1000,
+        "mean": (statistics.fmean(latencies) * 1000) if latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", action="append", required=True, help="label=base_url, repeatable")
+    parser.add_argument("--path", action="append", help="request path, repeatable (default: catalog reads)")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per target")
+    args = parser.parse_args()
+
+    paths = args.path or DEFAULT_PATHS
+    print(f"{'mode':<10}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>10}")
+    for target in args.target:
+        label, _, base_url = target.partition("=")
+        stats = run_target(base_url.rstrip("/"), paths, args.concurrency, args.duration)
+        print(
+            f"{label:<10}{stats['rps']:>10.1f}{stats['p50']:>10.1f}"
+            f"{stats['p95']:>10.1f}{stats['p99']:>10.1f}{stats['errors']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Measure catalog read latency while the service absorbs a burst of admin logins.
+
+The script first samples catalog latency on an idle service, then again while
+--storm-clients threads hammer POST /admin/login, and prints both side by side.
+Run it against the service with an existing admin account:
+
+    uvicorn main:app --port 8000
+    python benchmarks/login_storm.py --base-url http://localhost:8000 \
+        --email admin@example.com --password secret --storm-clients 64
+
+Comparing a build with bcrypt on the request threadpool against one using the
+password hasher's process pool shows how much the storm leaks into catalog reads.
+"""
+
+import argparse
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def sample_catalog(base_url, readers, duration):
+    latencies, errors = [], 0
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def reader():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(base_url + "/products/?limit=50", timeout=30) as response:
+                    response.read()
+                with lock:
+                    latencies.append(time.perf_counter() - start)
+            except (urllib.error.URLError, OSError):
+                with lock:
+                    errors += 1
+
+    with ThreadPoolExecutor(max_workers=readers) as pool:
+        for _ in range(readers):
+            pool.submit(reader)
+    return latencies, errors
+
+
+def login_storm(base_url, email, password, clients, stop):
+    body = urllib.parse.urlencode({"username": email, "password": password}).encode()
+    counts = {"ok": 0, "rejected": 0, "failed": 0}
+    lock = threading.Lock()
+
+    def client():
+        while not stop.is_set():
+            request = urllib.request.Request(base_url + "/admin/login", data=body, method="POST")
+            request.add_header("Content-Type", "application/x-www-form-urlencoded")
+            try:
+                with urllib.request.urlopen(request, timeout=60) as response:
+                    response.read()
+                outcome = "ok"
+            except urllib.error.HTTPError as exc:
+                outcome = "rejected" if exc.code == 503 else "failed"
+            except (urllib.error.URLError, OSError):
+                outcome = "failed"
+            with lock:
+                counts[outcome] += 1
+
+    threads = [threading.Thread(target=client, daemon=True) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    return threads, counts
+
+
+def report(label, latencies, errors):
+    print(
+        f"{label:<12}{len(latencies):>10}{percentile(latencies, 50) * 1000:>10.1f}"
+        f"{percentile(latencies, 95) * 1000:>10.1f}{percentile(latencies, 99) * 1000:>10.1f}{errors:>10}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--storm-clients", type=int, default=64)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+    base_url = args.base_url.rstrip("/")
+
+    print(f"{'phase':<12}{'requests':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>10}")
+    report("idle", *sample_catalog(base_url, args.readers, args.duration))
+
+    stop = threading.Event()
+    threads, counts = login_storm(base_url, args.email, args.password, args.storm_clients, stop)
+    try:
+        report("login storm", *sample_catalog(base_url, args.readers, args.duration))
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join(timeout=60)
+    print(f"logins: {counts['ok']} ok, {counts['rejected']} rejected with 503, {counts['failed']} failed")
+
+
+if __name__ == "__main__":
+    main()
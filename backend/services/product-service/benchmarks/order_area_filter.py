@@ -0,0 +1,88 @@
+"""Show the orders area filter switching from a sequential scan to an index lookup.
+
+Runs EXPLAIN ANALYZE for the old JSON predicate (customer->>'city') and for the
+indexed customer_city column. Point DATABASE_URL at a scratch database; --seed
+inserts synthetic orders first so the planner has a realistically sized table.
+
+    cd src && DATABASE_URL=postgresql://.../scratch \
+        python ../benchmarks/order_area_filter.py --seed 500000 --city Austin
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from sqlalchemy import text  # noqa: E402
+
+from db.session import engine  # noqa: E402
+
+CITIES = ["Austin", "Boston", "Chicago", "Denver", "Miami", "Portland", "Seattle", "Tucson"]
+
+QUERIES = {
+    "json ->> city": "SELECT id, order_date, total, status FROM orders WHERE customer->>'city' = :city",
+    "customer_city": "SELECT id, order_date, total, status FROM orders WHERE customer_city = :city",
+}
+
+
+def seed(count, batch_size=10000):
+    start = datetime(2024, 1, 1)
+    statement = text(
+        "INSERT INTO orders (id, customer, customer_email, customer_city, customer_state, customer_zip, "
+        "subtotal, tax, shipping, total, payment_method, order_date, status) "
+        "VALUES (:id, CAST(:customer AS JSON), :email, :city, :state, :zip, "
+        ":subtotal, :tax, 0, :total, 'stripe', :order_date, 'pending')"
+    )
+    for offset in range(0, count, batch_size):
+        rows = []
+        for n in range(offset, min(count, offset + batch_size)):
+            city = f"{random.choice(CITIES)}-{n % 500}"
+            customer = {"email": f"user{n}@example.com", "city": city, "state": "TX", "zipCode": f"{n % 99999:05d}"}
+            subtotal = round(random.uniform(10, 400), 2)
+            rows.append({
+                "id": uuid.uuid4(), "customer": json.dumps(customer), "email": customer["email"],
+                "city": city, "state": "TX", "zip": customer["zipCode"], "subtotal": subtotal,
+                "tax": round(subtotal * 0.08, 2), "total": round(subtotal * 1.08, 2),
+                "order_date": start + timedelta(minutes=n),
+            })
+        with engine.begin() as conn:
+            conn.execute(statement, rows)
+        print(f"seeded {min(count, offset + batch_size)} orders")
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE orders"))
+
+
+def explain(sql, city):
+    with engine.connect() as conn:
+        plan = conn.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}"), {"city": city}).scalar()
+    plan = plan[0] if isinstance(plan, list) else json.loads(plan)[0]
+    node = plan["Plan"]
+    while node.get("Plans") and node["Node Type"] not in ("Seq Scan", "Index Scan", "Bitmap Heap Scan", "Index Only Scan"):
+        node = node["Plans"][0]
+    return node["Node Type"], plan["Execution Time"], plan["Plan"].get("Actual Rows", 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, help="synthetic orders to insert first")
+    parser.add_argument("--city", default="Austin-1")
+    args = parser.parse_args()
+
+    if args.seed:
+        seed(args.seed)
+    with engine.connect() as conn:
+        size = conn.execute(text("SELECT count(*) FROM orders")).scalar()
+    print(f"orders table: {size} rows, filtering city = {args.city!r}")
+    print(f"{'predicate':<16}{'plan':>20}{'rows':>10}{'ms':>12}")
+    for label, sql in QUERIES.items():
+        node_type, elapsed, rows = explain(sql, args.city)
+        print(f"{label:<16}{node_type:>20}{rows:>10}{elapsed:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
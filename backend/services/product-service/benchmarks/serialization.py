@@ -0,0 +1,150 @@
+"""Per-row cost of serializing product and order list pages, before and after the orjson fast path.
+
+"before" is what the list routes used to do: load ORM entities and return them
+to FastAPI, which validates them against the response model (from_attributes)
+and serializes the result with the model's TypeAdapter (pydantic-core
+dump_json). "after" selects only the summary columns as row tuples and hands
+plain dicts to orjson.
+
+With no arguments, synthetic rows are serialized in-process so only encoding
+cost is measured. With --database the rows are read from DATABASE_URL as
+well, which adds entity construction versus plain row fetching:
+
+    cd src && python ../benchmarks/serialization.py --rows 200 --repeat 200
+    cd src && python ../benchmarks/serialization.py --database --rows 200 --repeat 50
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+from collections import namedtuple
+from datetime import datetime, timedelta
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import orjson  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+
+from models.order import Order, OrderStatus  # noqa: E402
+from models.product import Product  # noqa: E402
+from schemas.order import OrderSummary, ORDER_SUMMARY_COLUMNS  # noqa: E402
+from schemas.product import ProductPage, PRODUCT_SUMMARY_COLUMNS  # noqa: E402
+
+PRODUCT_PAGE = TypeAdapter(ProductPage)
+ORDER_LIST = TypeAdapter(List[OrderSummary])
+
+ProductRow = namedtuple("ProductRow", [c.key for c in PRODUCT_SUMMARY_COLUMNS])
+OrderRow = namedtuple("OrderRow", [c.key for c in ORDER_SUMMARY_COLUMNS])
+
+
+def products_before(entities) -> bytes:
+    page = {"items": entities, "next_cursor": None, "limit": len(entities)}
+    return PRODUCT_PAGE.dump_json(PRODUCT_PAGE.validate_python(page, from_attributes=True))
+
+
+def products_after(rows) -> bytes:
+    return orjson.dumps({"items": [row._asdict() for row in rows], "next_cursor": None, "limit": len(rows)})
+
+
+def orders_before(entities) -> bytes:
+    return ORDER_LIST.dump_json(ORDER_LIST.validate_python(entities, from_attributes=True))
+
+
+def orders_after(rows) -> bytes:
+    return orjson.dumps([row._asdict() for row in rows])
+
+
+def synthetic_products(count):
+    main, sub, group = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    breadcrumb = [{"id": str(main), "name": "Shoes"}, {"id": str(sub), "name": "Running"}, {"id": str(group), "name": "Trail"}]
+    entities, rows = [], []
+    for n in range(count):
+        values = dict(
+            id=uuid.uuid4(), title=f"Product {n}", price=19.99 + n,
+            colors=["Red", "Blue", "Black"], sizes=[7, 7.5, 8, 8.5, 9, 10],
+            assets=[f"https://cdn.example.com/p/{n}/{i}.jpg" for i in range(4)], breadcrumb=breadcrumb,
+        )
+        entities.append(Product(main_category_id=main, sub_category_id=sub, sub_group_id=group, **values))
+        rows.append(ProductRow(**values))
+    return entities, rows
+
+
+def synthetic_orders(count):
+    start = datetime(2024, 1, 1)
+    entities, rows = [], []
+    for n in range(count):
+        values = dict(id=uuid.uuid4(), order_date=start + timedelta(minutes=n), total=42.5 + n, status=OrderStatus.pending)
+        entities.append(Order(**values))
+        rows.append(OrderRow(**values))
+    return entities, rows
+
+
+def per_row_us(fn, rows, repeat):
+    fn()  # warm up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / (repeat * rows) * 1e6
+
+
+def report(name, before, after):
+    print(f"{name:<10} before {before:8.2f} us/row   after {after:8.2f} us/row   {before / after:5.1f}x")
+
+
+def run_synthetic(count, repeat):
+    entities, rows = synthetic_products(count)
+    assert orjson.loads(products_before(entities)) == orjson.loads(products_after(rows))
+    report("products", per_row_us(lambda: products_before(entities), count, repeat),
+           per_row_us(lambda: products_after(rows), count, repeat))
+
+    entities, rows = synthetic_orders(count)
+    assert orjson.loads(orders_before(entities)) == orjson.loads(orders_after(rows))
+    report("orders", per_row_us(lambda: orders_before(entities), count, repeat),
+           per_row_us(lambda: orders_after(rows), count, repeat))
+
+
+def run_database(count, repeat):
+    from db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        def fetch_entities(model):
+            # A fresh identity map each time, as a request would have
+            db.expunge_all()
+            return db.execute(select(model).limit(count)).scalars().all()
+
+        def fetch_rows(columns):
+            return db.execute(select(*columns).limit(count)).all()
+
+        for name, model, columns, before, after in (
+            ("products", Product, PRODUCT_SUMMARY_COLUMNS, products_before, products_after),
+            ("orders", Order, ORDER_SUMMARY_COLUMNS, orders_before, orders_after),
+        ):
+            rows = len(fetch_rows(columns))
+            if not rows:
+                print(f"{name:<10} no rows in the database, skipped")
+                continue
+            report(name, per_row_us(lambda: before(fetch_entities(model)), rows, repeat),
+                   per_row_us(lambda: after(fetch_rows(columns)), rows, repeat))
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200, help="rows per page")
+    parser.add_argument("--repeat", type=int, default=200, help="pages serialized per measurement")
+    parser.add_argument("--database", action="store_true", help="fetch the rows from DATABASE_URL too")
+    args = parser.parse_args()
+    if args.database:
+        run_database(args.rows, args.repeat)
+    else:
+        run_synthetic(args.rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Baseline schema, as previously created by create_all at startup
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+ORDER_STATUS = sa.Enum("pending", "processing", "shipped", "delivered", "cancelled", name="orderstatus")
+
+
+def upgrade():
+    op.create_table(
+        "admin_users",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column("email", sa.String(), nullable=False, unique=True),
+        sa.Column("password", sa.String(), nullable=False),
+    )
+    op.create_table(
+        "main_categories",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column("name", sa.String(50), nullable=False, unique=True),
+    )
+    op.create_table(
+        "sub_categories",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column("name", sa.String(50), nullable=False),
+        sa.Column("main_category_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("main_categories.id"), nullable=False),
+    )
+    op.create_table(
+        "sub_group",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column("name", sa.String(50), nullable=False),
+        sa.Column("sub_category_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("sub_categories.id"), nullable=False),
+    )
+    op.create_table(
+        "products",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column("title", sa.String(100), nullable=False),
+        sa.Column("description", sa.Text()),
+        sa.Column("price", sa.Float(), nullable=False),
+        sa.Column("main_category_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("main_categories.id"), nullable=False),
+        sa.Column("sub_category_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("sub_categories.id"), nullable=False),
+        sa.Column("sub_group_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("sub_group.id"), nullable=False),
+        sa.Column("colors", sa.JSON()),
+        sa.Column("sizes", sa.JSON()),
+        sa.Column("assets", sa.JSON()),
+    )
+    op.create_table(
+        "orders",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column("customer", sa.JSON(), nullable=False),
+        sa.Column("subtotal", sa.Float(), nullable=False),
+        sa.Column("tax", sa.Float(), nullable=False),
+        sa.Column("shipping", sa.Float(), nullable=False),
+        sa.Column("total", sa.Float(), nullable=False),
+        sa.Column("payment_method", sa.String(), nullable=False),
+        sa.Column("order_date", sa.DateTime(), nullable=False),
+        sa.Column("status", ORDER_STATUS, nullable=False),
+    )
+    op.create_table(
+        "order_items",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column("order_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("orders.id"), nullable=False),
+        sa.Column("product_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("products.id"), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("price", sa.Float(), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("color", sa.String(), nullable=False),
+        sa.Column("size", sa.Float(), nullable=False),
+        sa.Column("image", sa.String(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("order_items")
+    op.drop_table("orders")
+    ORDER_STATUS.drop(op.get_bind(), checkfirst=True)
+    op.drop_table("products")
+    op.drop_table("sub_group")
+    op.drop_table("sub_categories")
+    op.drop_table("main_categories")
+    op.drop_table("admin_users")
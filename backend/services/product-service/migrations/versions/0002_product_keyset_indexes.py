@@ -0,0 +1,25 @@
+"""Indexes backing keyset pagination of products by price and title
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index("ix_products_price_id", "products", ["price", "id"],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index("ix_products_title_id", "products", ["title", "id"],
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index("ix_products_title_id", table_name="products")
+    op.drop_index("ix_products_price_id", table_name="products")
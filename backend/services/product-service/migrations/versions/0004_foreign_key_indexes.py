@@ -0,0 +1,33 @@
+"""Indexes on the foreign key columns the hot routes filter and join on
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("products", "main_category_id"),
+    ("products", "sub_category_id"),
+    ("products", "sub_group_id"),
+    ("order_items", "order_id"),
+    ("sub_categories", "main_category_id"),
+    ("sub_group", "sub_category_id"),
+]
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for table, column in INDEXES:
+            op.create_index(f"ix_{table}_{column}", table, [column],
+                            postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade():
+    for table, column in INDEXES:
+        op.drop_index(f"ix_{table}_{column}", table_name=table)
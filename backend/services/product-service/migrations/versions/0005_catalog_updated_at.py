@@ -0,0 +1,29 @@
+"""updated_at on catalog tables, used for HTTP ETags
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+TABLES = ("products", "main_categories", "sub_categories", "sub_group")
+
+
+def upgrade():
+    # now() is not volatile, so on PostgreSQL 11+ adding the column with this
+    # default does not rewrite the table; existing rows read the migration time.
+    for table in TABLES:
+        op.execute(
+            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS updated_at "
+            "TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()"
+        )
+
+
+def downgrade():
+    for table in TABLES:
+        op.drop_column(table, "updated_at")
@@ -0,0 +1,31 @@
+"""Per-variant inventory
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "inventory",
+        sa.Column("product_id", postgresql.UUID(as_uuid=True),
+                  sa.ForeignKey("products.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("color", sa.String(), primary_key=True),
+        sa.Column("size", sa.Float(), primary_key=True),
+        sa.Column("quantity", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.CheckConstraint("quantity >= 0", name="ck_inventory_quantity_non_negative"),
+    )
+
+
+def downgrade():
+    op.drop_table("inventory")
@@ -0,0 +1,51 @@
+"""Materialized category path and breadcrumb on products
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def upgrade():
+    op.execute("ALTER TABLE products ADD COLUMN IF NOT EXISTS category_path VARCHAR")
+    op.execute("ALTER TABLE products ADD COLUMN IF NOT EXISTS breadcrumb JSON")
+
+    # Same derivation as category_paths.refresh_product_paths, in committed batches
+    update = (
+        "UPDATE products p SET main_category_id = m.id, sub_category_id = s.id, "
+        "category_path = concat(m.id, '/', s.id, '/', g.id), "
+        "breadcrumb = json_build_array(json_build_object('id', m.id, 'name', m.name), "
+        "json_build_object('id', s.id, 'name', s.name), json_build_object('id', g.id, 'name', g.name)) "
+        "FROM sub_group g JOIN sub_categories s ON s.id = g.sub_category_id "
+        "JOIN main_categories m ON m.id = s.main_category_id "
+        "WHERE p.sub_group_id = g.id"
+    )
+    backfill = sa.text(
+        update + " AND p.id IN (SELECT id FROM products WHERE category_path IS NULL LIMIT :batch_size)"
+    )
+    with op.get_context().autocommit_block():
+        if context.is_offline_mode():
+            # --sql output cannot loop on row counts; emit the backfill as one statement
+            op.execute(update + " AND p.category_path IS NULL")
+        else:
+            bind = op.get_bind()
+            while bind.execute(backfill, {"batch_size": BACKFILL_BATCH_SIZE}).rowcount == BACKFILL_BATCH_SIZE:
+                pass
+        op.create_index("ix_products_category_path", "products", ["category_path"],
+                        postgresql_ops={"category_path": "text_pattern_ops"},
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index("ix_products_category_path", table_name="products")
+    op.drop_column("products", "breadcrumb")
+    op.drop_column("products", "category_path")
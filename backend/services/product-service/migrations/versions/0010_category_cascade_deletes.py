@@ -0,0 +1,50 @@
+"""ON DELETE CASCADE on the category hierarchy foreign keys, index on order_items.product_id
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+# (table, column, referenced table); constraint names are PostgreSQL's defaults
+FOREIGN_KEYS = [
+    ("sub_categories", "main_category_id", "main_categories"),
+    ("sub_group", "sub_category_id", "sub_categories"),
+    ("products", "main_category_id", "main_categories"),
+    ("products", "sub_category_id", "sub_categories"),
+    ("products", "sub_group_id", "sub_group"),
+]
+
+
+def _replace(on_delete):
+    # NOT VALID skips the full-table check while the ACCESS EXCLUSIVE lock is held;
+    # VALIDATE then scans under a lock that does not block reads or writes.
+    for table, column, referenced in FOREIGN_KEYS:
+        name = f"{table}_{column}_fkey"
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}")
+        op.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY ({column}) "
+            f"REFERENCES {referenced} (id) {on_delete} NOT VALID"
+        )
+    with op.get_context().autocommit_block():
+        for table, column, _ in FOREIGN_KEYS:
+            op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {table}_{column}_fkey")
+
+
+def upgrade():
+    _replace("ON DELETE CASCADE")
+    # Every product delete checks order_items for references; without this index
+    # each check is a sequential scan of order_items.
+    with op.get_context().autocommit_block():
+        op.create_index("ix_order_items_product_id", "order_items", ["product_id"],
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index("ix_order_items_product_id", table_name="order_items")
+    _replace("")
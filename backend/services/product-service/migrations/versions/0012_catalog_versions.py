@@ -0,0 +1,44 @@
+"""Commit-ordered version counters for the catalog tables
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+CATALOG_TABLES = ("products", "main_categories", "sub_categories", "sub_group")
+
+
+def upgrade():
+    op.create_table(
+        "catalog_versions",
+        sa.Column("name", sa.String(63), primary_key=True),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    op.bulk_insert(
+        sa.table("catalog_versions", sa.column("name", sa.String)),
+        [{"name": table} for table in CATALOG_TABLES],
+    )
+    # Statement level, so a bulk write bumps once; cascaded deletes fire it on the child tables too
+    op.execute(
+        "CREATE FUNCTION bump_catalog_version() RETURNS trigger LANGUAGE plpgsql AS $$ "
+        "BEGIN UPDATE catalog_versions SET version = version + 1 WHERE name = TG_TABLE_NAME; RETURN NULL; END $$"
+    )
+    for table in CATALOG_TABLES:
+        op.execute(
+            f"CREATE TRIGGER {table}_catalog_version AFTER INSERT OR UPDATE OR DELETE ON {table} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_version()"
+        )
+
+
+def downgrade():
+    for table in CATALOG_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_catalog_version ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_catalog_version()")
+    op.drop_table("catalog_versions")
@@ -0,0 +1,21 @@
+"""Progress column for long-running jobs
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0013"
+down_revision = "0012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("jobs", sa.Column("progress", sa.JSON()))
+
+
+def downgrade():
+    op.drop_column("jobs", "progress")
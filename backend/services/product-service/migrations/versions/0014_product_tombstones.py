@@ -0,0 +1,45 @@
+"""Product tombstones and an updated_at index for the search index delta sync
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0014"
+down_revision = "0013"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "product_tombstones",
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("product_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.PrimaryKeyConstraint("deleted_at", "product_id"),
+    )
+    # Statement level with a transition table: one INSERT ... SELECT per DELETE,
+    # however many rows it removes, including deletes cascaded from the categories
+    op.execute(
+        "CREATE FUNCTION record_product_tombstones() RETURNS trigger LANGUAGE plpgsql AS $$ "
+        "BEGIN INSERT INTO product_tombstones (deleted_at, product_id) SELECT now(), id FROM deleted_products "
+        "ON CONFLICT DO NOTHING; RETURN NULL; END $$"
+    )
+    op.execute(
+        "CREATE TRIGGER products_tombstones AFTER DELETE ON products "
+        "REFERENCING OLD TABLE AS deleted_products "
+        "FOR EACH STATEMENT EXECUTE FUNCTION record_product_tombstones()"
+    )
+    with op.get_context().autocommit_block():
+        op.create_index("ix_products_updated_at", "products", ["updated_at"],
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index("ix_products_updated_at", table_name="products")
+    op.execute("DROP TRIGGER IF EXISTS products_tombstones ON products")
+    op.execute("DROP FUNCTION IF EXISTS record_product_tombstones()")
+    op.drop_table("product_tombstones")
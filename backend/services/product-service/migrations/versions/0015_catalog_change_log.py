@@ -0,0 +1,42 @@
+"""Append-only change log behind the catalog versions
+
+Revision ID: 0015
+Revises: 0014
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0015"
+down_revision = "0014"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "catalog_changes",
+        sa.Column("id", sa.BigInteger(), sa.Identity(always=True), primary_key=True),
+        sa.Column("table_name", sa.String(63), nullable=False),
+    )
+    op.create_index("ix_catalog_changes_table_name", "catalog_changes", ["table_name"])
+    # The triggers from 0012 now append a row instead of bumping the shared counter
+    # row, so concurrent writers no longer queue on (or deadlock over) its lock
+    op.execute(
+        "CREATE OR REPLACE FUNCTION bump_catalog_version() RETURNS trigger LANGUAGE plpgsql AS $$ "
+        "BEGIN INSERT INTO catalog_changes (table_name) VALUES (TG_TABLE_NAME); RETURN NULL; END $$"
+    )
+
+
+def downgrade():
+    op.execute(
+        "UPDATE catalog_versions SET version = version + pending.n "
+        "FROM (SELECT table_name, count(*) AS n FROM catalog_changes GROUP BY table_name) AS pending "
+        "WHERE catalog_versions.name = pending.table_name"
+    )
+    op.execute(
+        "CREATE OR REPLACE FUNCTION bump_catalog_version() RETURNS trigger LANGUAGE plpgsql AS $$ "
+        "BEGIN UPDATE catalog_versions SET version = version + 1 WHERE name = TG_TABLE_NAME; RETURN NULL; END $$"
+    )
+    op.drop_index("ix_catalog_changes_table_name", table_name="catalog_changes")
+    op.drop_table("catalog_changes")
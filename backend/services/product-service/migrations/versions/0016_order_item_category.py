@@ -0,0 +1,42 @@
+"""Main category snapshot on order items, so sales rollups reverse into the right bucket
+
+Revision ID: 0016
+Revises: 0015
+Create Date: 2026-10-18
+"""
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0016"
+down_revision = "0015"
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def upgrade():
+    op.add_column("order_items", sa.Column("main_category_id", postgresql.UUID(as_uuid=True)))
+
+    # Existing items take their product's current category, the best record there is;
+    # items of deleted products stay NULL and are left out of the category rollup.
+    pending = "order_items.main_category_id IS NULL AND order_items.product_id = products.id"
+    backfill = sa.text(
+        "UPDATE order_items SET main_category_id = products.main_category_id FROM products "
+        f"WHERE {pending} AND order_items.id IN ("
+        "SELECT order_items.id FROM order_items JOIN products ON order_items.product_id = products.id "
+        "WHERE order_items.main_category_id IS NULL LIMIT :batch_size)"
+    )
+    with op.get_context().autocommit_block():
+        if context.is_offline_mode():
+            # --sql output cannot loop on row counts; emit the backfill as one statement
+            op.execute(f"UPDATE order_items SET main_category_id = products.main_category_id FROM products WHERE {pending}")
+        else:
+            bind = op.get_bind()
+            while bind.execute(backfill, {"batch_size": BACKFILL_BATCH_SIZE}).rowcount == BACKFILL_BATCH_SIZE:
+                pass
+
+
+def downgrade():
+    op.drop_column("order_items", "main_category_id")
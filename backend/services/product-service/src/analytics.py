@@ -0,0 +1,142 @@
+#analytics.py
+
+import os
+import random
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import date
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from jobs import job_handler
+from models.analytics import DailySales, StatusCount, ProductSales, CitySales, CategorySales
+from models.order import OrderStatus
+
+ANALYTICS_SHARDS = int(os.getenv("ANALYTICS_SHARDS", "8"))
+
+
+@dataclass
+class SaleLine:
+    product_id: UUID
+    name: str
+    main_category_id: Optional[UUID]
+    quantity: int
+    revenue: float
+
+
+@dataclass
+class OrderSales:
+    day: date
+    city: Optional[str]
+    total: float
+    lines: List[SaleLine] = field(default_factory=list)
+
+    def to_payload(self) -> dict:
+        # JSON-safe form for the job queue
+        return {
+            "day": self.day.isoformat(),
+            "city": self.city,
+            "total": self.total,
+            "lines": [
+                [str(line.product_id), line.name, str(line.main_category_id) if line.main_category_id else None,
+                 line.quantity, line.revenue]
+                for line in self.lines
+            ],
+        }
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "OrderSales":
+        lines = [
+            SaleLine(UUID(product_id), name, UUID(category_id) if category_id else None, quantity, revenue)
+            for product_id, name, category_id, quantity, revenue in payload["lines"]
+        ]
+        return cls(date.fromisoformat(payload["day"]), payload["city"], payload["total"], lines)
+
+
+def _increment(db, model, keys, counters, rows, shard):
+    # rows maps a key tuple to {column: value}; counters are added to the stored
+    # row, other columns overwrite it. Rows go in key order to keep lock order stable.
+    if not rows:
+        return
+    values = [
+        dict(zip(keys, key), shard=shard, **columns)
+        for key, columns in sorted(rows.items(), key=lambda item: tuple(map(str, item[0])))
+    ]
+    stmt = pg_insert(model).values(values)
+    set_ = {column: stmt.excluded[column] for column in values[0] if column not in (*keys, "shard")}
+    set_.update({column: getattr(model, column) + stmt.excluded[column] for column in counters})
+    db.execute(stmt.on_conflict_do_update(index_elements=[*keys, "shard"], set_=set_))
+
+
+def count_status(db, deltas: dict):
+    rows = {(status,): {"orders": delta} for status, delta in deltas.items() if delta}
+    _increment(db, StatusCount, ("status",), ("orders",), rows, random.randrange(ANALYTICS_SHARDS))
+
+
+def count_sales(db, sales: OrderSales, sign: int):
+    # Adds (sign=1) or removes (sign=-1) one order's contribution to the revenue rollups
+    shard = random.randrange(ANALYTICS_SHARDS)
+    _increment(db, DailySales, ("day",), ("orders", "revenue"),
+               {(sales.day,): {"orders": sign, "revenue": sign * sales.total}}, shard)
+    if sales.city:
+        _increment(db, CitySales, ("city",), ("orders", "revenue"),
+                   {(sales.city,): {"orders": sign, "revenue": sign * sales.total}}, shard)
+
+    products = defaultdict(Counter)
+    names = {}
+    categories = defaultdict(Counter)
+    for line in sales.lines:
+        products[line.product_id].update(units=sign * line.quantity, revenue=sign * line.revenue)
+        names[line.product_id] = line.name
+        if line.main_category_id is not None:
+            categories[line.main_category_id].update(units=sign * line.quantity, revenue=sign * line.revenue)
+    _increment(db, ProductSales, ("product_id",), ("units", "revenue"),
+               {(pid,): {"name": names[pid], **totals} for pid, totals in products.items()}, shard)
+    _increment(db, CategorySales, ("main_category_id",), ("units", "revenue"),
+               {(cid,): dict(totals) for cid, totals in categories.items()}, shard)
+
+
+def order_sales(order) -> OrderSales:
+    # Categories come from the items' checkout snapshot, not the products as they are
+    # now, so a reversal undoes exactly what record_new_order added
+    lines = [
+        SaleLine(item.product_id, item.name, item.main_category_id, item.quantity, item.price * item.quantity)
+        for item in order.items
+    ]
+    return OrderSales(order.order_date.date(), order.customer_city, order.total, lines)
+
+
+# Hooks for the order write paths; each runs inside the caller's transaction.
+# Cancelled orders count towards their status but not towards revenue.
+
+def record_new_order(db, sales: OrderSales, status: OrderStatus = OrderStatus.pending):
+    count_status(db, {status: 1})
+    if status != OrderStatus.cancelled:
+        count_sales(db, sales, 1)
+
+
+@job_handler("analytics.record_order")
+def record_order_job(db, job):
+    # Enqueued by checkout. The rollup increments commute, so a status change
+    # that is counted before this job runs still leaves the totals right.
+    record_new_order(db, OrderSales.from_payload(job.payload))
+
+
+def record_status_change(db, order, new_status: OrderStatus):
+    # Call before assigning new_status to the order
+    old_status = order.status
+    if old_status == new_status:
+        return
+    count_status(db, {old_status: -1, new_status: 1})
+    if new_status == OrderStatus.cancelled:
+        count_sales(db, order_sales(order), -1)
+    elif old_status == OrderStatus.cancelled:
+        count_sales(db, order_sales(order), 1)
+
+
+def record_order_deleted(db, order):
+    count_status(db, {order.status: -1})
+    if order.status != OrderStatus.cancelled:
+        count_sales(db, order_sales(order), -1)
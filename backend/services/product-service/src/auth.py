@@ -1,5 +1,10 @@
 # auth.py
-from passlib.context import CryptContext
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from uuid import UUID
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
@@ -7,14 +12,79 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from models.admin import AdminUser
 from database import get_db
+from password_hashing import pwd_context
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 SECRET_KEY = "ecommerce_webapp"  # Replace with a secure key
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+ADMIN_AUTH_CACHE_TTL_SECONDS = float(os.getenv("ADMIN_AUTH_CACHE_TTL_SECONDS", "60"))
+ADMIN_AUTH_CACHE_MAX_ENTRIES = int(os.getenv("ADMIN_AUTH_CACHE_MAX_ENTRIES", "1024"))
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/admin/login")
 
+@dataclass(frozen=True)
+class AdminPrincipal:
+    id: UUID
+    email: str
+
+class AdminTokenCache:
+    # LRU of validated bearer token -> AdminPrincipal. Entries live for the TTL or
+    # until the token expires, whichever comes first. Each worker process holds its
+    # own cache and nothing evicts an entry early, so a changed or deleted admin
+    # keeps being served from it for up to ADMIN_AUTH_CACHE_TTL_SECONDS.
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # token -> (principal, monotonic expiry)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, token: str):
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None and entry[1] > time.monotonic():
+                self._entries.move_to_end(token)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[token]
+            self.misses += 1
+            return None
+
+    def put(self, token: str, principal: AdminPrincipal, token_exp: float):
+        lifetime = min(self.ttl_seconds, token_exp - time.time())
+        if lifetime <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[token] = (principal, time.monotonic() + lifetime)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+admin_token_cache = AdminTokenCache(ADMIN_AUTH_CACHE_MAX_ENTRIES, ADMIN_AUTH_CACHE_TTL_SECONDS)
+
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -29,6 +99,10 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     return encoded_jwt
 
 def get_current_admin(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    principal = admin_token_cache.get(token)
+    if principal is not None:
+        return principal
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -44,4 +118,6 @@ def get_current_admin(token: str = Depends(oauth2_scheme), db: Session = Depends
     admin = db.query(AdminUser).filter(AdminUser.email == email).first()
     if admin is None:
         raise credentials_exception
-    return admin
\ No newline at end of file
+    principal = AdminPrincipal(id=admin.id, email=admin.email)
+    admin_token_cache.put(token, principal, float(payload.get("exp", 0)))
+    return principal
\ No newline at end of file
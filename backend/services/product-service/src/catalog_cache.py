@@ -0,0 +1,81 @@
+#catalog_cache.py
+
+import hashlib
+import os
+import threading
+import time
+
+# How long a worker serves its cached tree before checking the catalog version again
+CATEGORY_TREE_CHECK_SECONDS = float(os.getenv("CATEGORY_TREE_CHECK_SECONDS", "2"))
+
+
+class CategoryTreeCache:
+    # Holds the serialized /categories/tree body and its ETag. Every category,
+    # subcategory or subgroup write through this worker bumps the local version;
+    # a rebuild that started before an invalidation is discarded instead of being
+    # stored. Writes made elsewhere are caught by comparing the database version
+    # of the category tables (see http_cache.table_version_stmt) at most every
+    # check_seconds, so other workers never serve a tree older than that.
+
+    def __init__(self, check_seconds: float = CATEGORY_TREE_CHECK_SECONDS):
+        self.check_seconds = check_seconds
+        self._lock = threading.Lock()
+        self._version = 0
+        self._entry = None
+        self._db_version = None
+        self._fresh_until = 0.0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def _cached(self, db_version=None):
+        # The entry if it can be served without a rebuild; db_version=None checks the clock only
+        with self._lock:
+            if self._entry is None:
+                return None
+            if db_version is None:
+                return self._entry if time.monotonic() < self._fresh_until else None
+            if db_version == self._db_version:
+                self._fresh_until = time.monotonic() + self.check_seconds
+                return self._entry
+            return None
+
+    def get_or_build(self, build, load_version):
+        entry = self._cached()
+        if entry is not None:
+            return entry
+        db_version = load_version()
+        entry = self._cached(db_version)
+        if entry is not None:
+            return entry
+        version = self._version
+        return self._store(version, db_version, build())
+
+    async def get_or_build_async(self, build, load_version):
+        entry = self._cached()
+        if entry is not None:
+            return entry
+        db_version = await load_version()
+        entry = self._cached(db_version)
+        if entry is not None:
+            return entry
+        version = self._version
+        return self._store(version, db_version, await build())
+
+    def _store(self, version: int, db_version, payload: bytes):
+        entry = (payload, '"%s"' % hashlib.sha1(payload).hexdigest())
+        with self._lock:
+            if self._version == version:
+                self._entry = entry
+                self._db_version = db_version
+                self._fresh_until = time.monotonic() + self.check_seconds
+        return entry
+
+    def invalidate(self):
+        with self._lock:
+            self._version += 1
+            self._entry = None
+
+
+category_tree_cache = CategoryTreeCache()
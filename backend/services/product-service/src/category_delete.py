@@ -0,0 +1,122 @@
+#category_delete.py
+
+import os
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import delete, exists, func, select
+from sqlalchemy.exc import IntegrityError
+
+from category_paths import CATEGORY_COLUMNS
+from jobs import PermanentJobError, checkpoint, enqueue, job_handler
+from models.category import MainCategory
+from models.order import OrderItem
+from models.product import Product
+from models.subcategory import SubCategory
+from models.subgroup import SubGroup
+from product_cache import product_cache
+from search_index import product_search_index
+
+CATEGORY_DELETE_BATCH_SIZE = int(os.getenv("CATEGORY_DELETE_BATCH_SIZE", "1000"))
+# A synchronous delete evicts up to this many products from the product cache one
+# by one; a larger subtree clears the whole cache instead of loading every id
+CATEGORY_DELETE_EVICT_LIMIT = int(os.getenv("CATEGORY_DELETE_EVICT_LIMIT", "1000"))
+CATEGORY_DELETE_JOB = "catalog.delete_category"
+
+CATEGORY_MODELS = {"main": MainCategory, "sub": SubCategory, "group": SubGroup}
+
+
+def _referenced(in_category):
+    return select(func.count()).select_from(Product).where(
+        in_category, exists().where(OrderItem.product_id == Product.id)
+    )
+
+
+def _in_use(referenced: int) -> HTTPException:
+    return HTTPException(status_code=409, detail=f"{referenced} products in this category are referenced by orders")
+
+
+def delete_category_now(db, field: str, category):
+    # The synchronous delete behind the category routes: one statement, cascading to
+    # the subcategories, subgroups and products below. order_items has no ON DELETE,
+    # so a subtree with ordered products is refused with 409 instead of failing in
+    # the database; an order placed meanwhile hits the IntegrityError and gets the same.
+    in_category = CATEGORY_COLUMNS[field] == category.id
+    referenced = db.execute(_referenced(in_category)).scalar()
+    if referenced:
+        raise _in_use(referenced)
+    product_ids = db.execute(
+        select(Product.id).where(in_category).limit(CATEGORY_DELETE_EVICT_LIMIT + 1)
+    ).scalars().all()
+    db.delete(category)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise _in_use(db.execute(_referenced(in_category)).scalar())
+    if len(product_ids) > CATEGORY_DELETE_EVICT_LIMIT:
+        product_cache.clear()
+    else:
+        product_cache.invalidate(*product_ids)
+    product_search_index.remove_category(field, category.id)
+
+
+def enqueue_category_delete(db, field: str, category_id) -> UUID:
+    # Queued in the caller's transaction; a worker (worker.py) runs it after commit
+    return enqueue(db, CATEGORY_DELETE_JOB, {"field": field, "category_id": str(category_id)})
+
+
+@job_handler(CATEGORY_DELETE_JOB)
+def delete_category(db, job, batch_size: int = CATEGORY_DELETE_BATCH_SIZE):
+    # Deletes the products under a category in short batches, one transaction
+    # each, then the category itself; its subcategories and subgroups go with it
+    # through ON DELETE CASCADE. No transaction holds more than one batch of
+    # product row locks, and readers and writers of other products never wait.
+    # Every batch commits with the job's progress, so a job picked up again after
+    # a crash resumes where it stopped. API workers pick the change up through the
+    # catalog versions (search index, category tree) and the shared product cache.
+    field = job.payload["field"]
+    category_id = UUID(job.payload["category_id"])
+    in_category = CATEGORY_COLUMNS[field] == category_id
+    progress = dict(job.progress or {})
+    if "total_products" not in progress:
+        progress["total_products"] = db.execute(select(func.count()).select_from(Product).where(in_category)).scalar()
+        progress["deleted_products"] = 0
+        checkpoint(db, job, progress)
+
+    # correlate(None): the subquery selects from products on its own, independent of the DELETE target
+    deletable = select(Product.id).where(
+        in_category, ~exists().where(OrderItem.product_id == Product.id)
+    ).limit(batch_size).correlate(None)
+    while True:
+        deleted_ids = db.execute(
+            delete(Product).where(Product.id.in_(deletable.scalar_subquery()))
+            .returning(Product.id)
+            .execution_options(synchronize_session=False)
+        ).scalars().all()
+        progress = dict(progress, deleted_products=progress["deleted_products"] + len(deleted_ids))
+        checkpoint(db, job, progress)
+        product_cache.invalidate(*deleted_ids)
+        if len(deleted_ids) < batch_size:
+            break
+
+    remaining = db.execute(select(func.count()).select_from(Product).where(in_category)).scalar()
+    if remaining:
+        raise PermanentJobError(f"{remaining} products are referenced by orders and were kept")
+    model = CATEGORY_MODELS[field]
+    db.execute(delete(model).where(model.id == category_id))
+
+
+def job_progress(job) -> dict:
+    # Response body of GET /admin/jobs/{job_id}
+    return {
+        "id": str(job.id),
+        "kind": job.kind,
+        "status": job.status,
+        "attempts": job.attempts,
+        "payload": job.payload,
+        "progress": job.progress,
+        "error": job.last_error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
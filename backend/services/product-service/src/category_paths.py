@@ -0,0 +1,64 @@
+#category_paths.py
+
+from sqlalchemy import func, update
+
+from models.category import MainCategory
+from models.product import Product
+from models.subcategory import SubCategory
+from models.subgroup import SubGroup
+
+# products.category_path is "<main id>/<sub id>/<group id>" and products.breadcrumb
+# the matching [{"id", "name"}] list, both derived from the product's subgroup.
+# The subgroup is the source of truth: a refresh also rewrites main_category_id and
+# sub_category_id, so the three foreign keys cannot drift apart.
+
+
+# Product column per category level, keyed like ProductSearchIndex.remove_category
+CATEGORY_COLUMNS = {
+    "main": Product.main_category_id,
+    "sub": Product.sub_category_id,
+    "group": Product.sub_group_id,
+}
+
+# Product fields whose change requires a path refresh
+CATEGORY_FIELDS = {"main_category_id", "sub_category_id", "sub_group_id"}
+
+
+def category_prefix(main_category_id, sub_category_id=None, sub_group_id=None) -> str:
+    # LIKE pattern matching a whole subtree through the text_pattern_ops index
+    parts = [str(part) for part in (main_category_id, sub_category_id, sub_group_id) if part is not None]
+    return "/".join(parts) + "/%" if len(parts) < 3 else "/".join(parts)
+
+
+def in_category(main_category_id, sub_category_id=None, sub_group_id=None):
+    return Product.category_path.like(category_prefix(main_category_id, sub_category_id, sub_group_id))
+
+
+def _crumb(model):
+    return func.json_build_object("id", model.id, "name", model.name)
+
+
+def refresh_product_paths(db, *scope) -> list:
+    # One set-based UPDATE ... FROM over the products selected by scope (criteria on
+    # Product, MainCategory, SubCategory or SubGroup). Runs in the caller's transaction
+    # and returns the ids of the products it rewrote. Pending ORM changes are flushed first.
+    db.flush()
+    stmt = (
+        update(Product)
+        .where(
+            Product.sub_group_id == SubGroup.id,
+            SubGroup.sub_category_id == SubCategory.id,
+            SubCategory.main_category_id == MainCategory.id,
+            *scope,
+        )
+        .values(
+            main_category_id=MainCategory.id,
+            sub_category_id=SubCategory.id,
+            category_path=func.concat(MainCategory.id, "/", SubCategory.id, "/", SubGroup.id),
+            breadcrumb=func.json_build_array(_crumb(MainCategory), _crumb(SubCategory), _crumb(SubGroup)),
+            updated_at=func.now(),
+        )
+        .returning(Product.id)
+        .execution_options(synchronize_session=False)
+    )
+    return db.execute(stmt).scalars().all()
@@ -1,8 +1,58 @@
-from db.session import SessionLocal
+import os
+from fastapi import Request
+from db.session import SessionLocal, AsyncSessionLocal, replica_router
 
-def get_db():
+# Requests that may be served by a read replica. A client that just made a
+# successful write carries the sticky cookie and reads from the primary until it
+# expires, so it sees its own writes; keep it longer than DB_REPLICA_MAX_LAG_SECONDS.
+REPLICA_METHODS = {"GET", "HEAD"}
+STICKY_PRIMARY_COOKIE = "db_primary"
+DB_STICKY_PRIMARY_SECONDS = int(os.getenv("DB_STICKY_PRIMARY_SECONDS", "10"))
+
+def _read_replica(request: Request):
+    if request.method not in REPLICA_METHODS or STICKY_PRIMARY_COOKIE in request.cookies:
+        return None
+    return replica_router.pick()
+
+def get_session_factory(request: Request):
+    # The session factory get_db would use, for code that opens its own sessions
+    # (the streaming responses, which outlive the request's session)
+    replica = _read_replica(request)
+    return replica.session_factory if replica else SessionLocal
+
+def get_db(request: Request):
+    db = get_session_factory(request)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def get_primary_db():
+    # For reads that must not be stale, such as the loads that fill shared caches
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db(request: Request):
+    replica = _read_replica(request)
+    async with (replica.async_session_factory() if replica else AsyncSessionLocal()) as db:
+        yield db
+
+async def get_async_primary_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def sticky_primary_middleware(request, call_next):
+    response = await call_next(request)
+    if (
+        replica_router.replicas
+        and request.method not in REPLICA_METHODS
+        and request.method != "OPTIONS"
+        and response.status_code < 400
+    ):
+        response.set_cookie(
+            STICKY_PRIMARY_COOKIE, "1", max_age=DB_STICKY_PRIMARY_SECONDS, httponly=True, samesite="lax"
+        )
+    return response
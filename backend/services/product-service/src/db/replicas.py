@@ -0,0 +1,126 @@
+#db/replicas.py
+
+import itertools
+import logging
+import threading
+
+from sqlalchemy import event, text
+
+logger = logging.getLogger(__name__)
+
+# Seconds the replica is behind the primary. Zero when it has replayed everything it
+# received (an idle primary writes no new transactions, so the replay timestamp alone
+# would grow forever); zero on a standalone server such as a local stand-in. NULL when
+# no WAL receiver is streaming: a replica cut off from the primary replays what it has
+# and would otherwise report zero lag forever while falling arbitrarily behind.
+REPLICATION_LAG_SQL = text(
+    "SELECT CASE"
+    " WHEN NOT pg_is_in_recovery() THEN 0"
+    " WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN NULL"
+    " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+    " END"
+)
+
+
+class Replica:
+    # One read replica. It starts unhealthy and takes traffic after its first passing check.
+
+    def __init__(self, name: str, engine, session_factory, async_engine=None, async_session_factory=None):
+        self.name = name
+        self.engine = engine
+        self.session_factory = session_factory
+        self.async_engine = async_engine
+        self.async_session_factory = async_session_factory
+        self.healthy = False
+        self.lag_seconds = None
+        self.last_error = None
+        # A dropped connection during a request takes the replica out of rotation
+        # right away instead of waiting for the next check
+        event.listen(engine, "handle_error", self._on_error)
+        if async_engine is not None:
+            event.listen(async_engine.sync_engine, "handle_error", self._on_error)
+
+    def _on_error(self, context):
+        if context.is_disconnect:
+            self.healthy = False
+
+    def check(self, timeout_seconds: float):
+        try:
+            with self.engine.connect() as conn:
+                conn.execute(text(f"SET LOCAL statement_timeout = {int(timeout_seconds * 1000)}"))
+                lag = conn.execute(REPLICATION_LAG_SQL).scalar()
+            if lag is None:
+                raise RuntimeError("WAL receiver is not streaming from the primary")
+            self.lag_seconds = float(lag)
+            self.healthy = True
+            self.last_error = None
+        except Exception as exc:
+            if self.healthy:
+                logger.warning("replica %s failed its health check: %s", self.name, exc)
+            self.healthy = False
+            self.last_error = str(exc)
+
+
+class ReplicaRouter:
+    # Picks a replica for a read-only session, round robin over the replicas that
+    # passed their last health check and are within max_lag_seconds of the primary.
+    # pick() returns None when there are none, and callers fall back to the primary.
+    # Checks run on a background thread every check_interval seconds.
+
+    def __init__(self, replicas: list, max_lag_seconds: float, check_interval: float):
+        self.replicas = replicas
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self._counter = itertools.count()
+        self._stop = threading.Event()
+        self._thread = None
+        self.replica_sessions = 0
+        self.fallbacks = 0
+
+    def _usable(self) -> list:
+        return [
+            replica for replica in self.replicas
+            if replica.healthy and replica.lag_seconds is not None and replica.lag_seconds <= self.max_lag_seconds
+        ]
+
+    def pick(self):
+        if not self.replicas:
+            return None
+        usable = self._usable()
+        if not usable:
+            self.fallbacks += 1
+            return None
+        self.replica_sessions += 1
+        return usable[next(self._counter) % len(usable)]
+
+    def check_all(self):
+        for replica in self.replicas:
+            replica.check(timeout_seconds=self.check_interval)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.check_all()
+            self._stop.wait(self.check_interval)
+
+    def start(self):
+        if self.replicas and self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="replica-health", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread = None
+
+    def stats(self) -> dict:
+        stats = {
+            "configured": len(self.replicas),
+            "usable": len(self._usable()),
+            "replica_sessions": self.replica_sessions,
+            "fallbacks": self.fallbacks,
+        }
+        for index, replica in enumerate(self.replicas):
+            stats[f"{index}_healthy"] = int(replica.healthy)
+            stats[f"{index}_lag_seconds"] = replica.lag_seconds if replica.lag_seconds is not None else -1
+        return stats
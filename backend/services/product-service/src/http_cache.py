@@ -0,0 +1,70 @@
+#http_cache.py
+
+import hashlib
+import os
+
+from fastapi import Request, Response
+from sqlalchemy import delete, func, select, update
+
+from models.catalog_version import CatalogChange, CatalogVersion
+
+# Public catalog responses may be reused for max-age seconds, and served stale
+# for another stale-while-revalidate seconds while a cache refetches in the background.
+CATALOG_MAX_AGE = int(os.getenv("CATALOG_MAX_AGE", "60"))
+CATALOG_STALE_WHILE_REVALIDATE = int(os.getenv("CATALOG_STALE_WHILE_REVALIDATE", "300"))
+CATALOG_CACHE_CONTROL = (
+    f"public, max-age={CATALOG_MAX_AGE}, stale-while-revalidate={CATALOG_STALE_WHILE_REVALIDATE}"
+)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag.removeprefix("W/") in candidates
+
+
+def version_etag(*parts) -> str:
+    # Strong ETag derived from row identity and a version rather than the body
+    return '"%s"' % hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()
+
+
+def catalog_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": CATALOG_CACHE_CONTROL}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=catalog_headers(etag))
+
+
+def table_version_stmt(*models):
+    # Number of statements that have written the tables: the compacted counters plus
+    # the change log rows not yet folded into them, read in one snapshot. Log rows
+    # become visible at commit, so unlike max(updated_at), which is stamped at
+    # transaction start, a slow transaction that commits last still changes the
+    # version. Writers only append to the log and never wait on each other.
+    names = [model.__tablename__ for model in models]
+    compacted = select(func.coalesce(func.sum(CatalogVersion.version), 0)).where(CatalogVersion.name.in_(names))
+    pending = select(func.count()).select_from(CatalogChange).where(CatalogChange.table_name.in_(names))
+    return select(compacted.scalar_subquery() + pending.scalar_subquery())
+
+
+def compact_catalog_changes(db) -> int:
+    # Folds the change log into the counters, one table per transaction. The log rows
+    # and the counter move in one commit, so readers never see a version go backwards.
+    # Concurrent compactions each count only the rows their own DELETE removed.
+    folded = 0
+    for name in db.execute(select(CatalogVersion.name).order_by(CatalogVersion.name)).scalars().all():
+        moved = db.execute(delete(CatalogChange).where(CatalogChange.table_name == name)).rowcount
+        if moved:
+            db.execute(
+                update(CatalogVersion).where(CatalogVersion.name == name)
+                .values(version=CatalogVersion.version + moved)
+            )
+        db.commit()
+        folded += moved
+    return folded
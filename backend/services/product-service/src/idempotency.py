@@ -0,0 +1,82 @@
+#idempotency.py
+
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from models.idempotency import IdempotencyKey
+
+# How long a key is remembered; a retry after this window runs as a new request
+IDEMPOTENCY_KEY_TTL_HOURS = float(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+IDEMPOTENCY_PURGE_BATCH_SIZE = int(os.getenv("IDEMPOTENCY_PURGE_BATCH_SIZE", "5000"))
+
+
+def request_fingerprint(payload: dict) -> str:
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def find_replay(db, key: str, fingerprint: str):
+    # Returns the stored response for a completed request with this key, or None
+    record = db.get(IdempotencyKey, key)
+    if record is None:
+        return None
+    if record.created_at < datetime.now(timezone.utc) - timedelta(hours=IDEMPOTENCY_KEY_TTL_HOURS):
+        db.execute(delete(IdempotencyKey).where(IdempotencyKey.key == key))
+        db.commit()
+        return None
+    if record.request_hash != fingerprint:
+        raise HTTPException(status_code=422, detail="Idempotency-Key was already used with a different request")
+    return JSONResponse(
+        content=record.response,
+        status_code=record.status_code,
+        headers={"Idempotent-Replayed": "true"},
+    )
+
+
+def claim_key(db, key: str, fingerprint: str) -> bool:
+    # Inserts the key inside the caller's transaction. A concurrent request holding
+    # the same key makes this wait until it commits, then returns False.
+    claimed = db.execute(
+        pg_insert(IdempotencyKey)
+        .values(key=key, request_hash=fingerprint)
+        .on_conflict_do_nothing(index_elements=[IdempotencyKey.key])
+        .returning(IdempotencyKey.key)
+    ).first()
+    return claimed is not None
+
+
+def store_response(db, key: str, status_code: int, body):
+    db.execute(
+        update(IdempotencyKey)
+        .where(IdempotencyKey.key == key)
+        .values(status_code=status_code, response=body)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def purge_expired_keys(db, batch_size: int = IDEMPOTENCY_PURGE_BATCH_SIZE) -> int:
+    # Run periodically by the job worker (worker.py). Deletes in short batches, one
+    # transaction each, walking ix_idempotency_keys_created_at; find_replay only
+    # drops an expired key when the same key is sent again.
+    expired = (
+        select(IdempotencyKey.key)
+        .where(IdempotencyKey.created_at < func.now() - timedelta(hours=IDEMPOTENCY_KEY_TTL_HOURS))
+        .limit(batch_size)
+    )
+    purged = 0
+    while True:
+        deleted = db.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.key.in_(expired.scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        purged += deleted
+        if deleted < batch_size:
+            return purged
@@ -0,0 +1,64 @@
+#inventory.py
+
+from collections import Counter
+
+from fastapi import HTTPException
+from sqlalchemy import select, update
+
+from models.inventory import Inventory
+
+
+def _variant_totals(items):
+    # items yield (product_id, color, size, quantity). Quantities are merged per
+    # variant and returned in key order: every transaction takes its row locks in
+    # the same order, so concurrent checkouts queue on a hot row instead of deadlocking.
+    totals = Counter()
+    for product_id, color, size, quantity in items:
+        totals[(product_id, color, float(size))] += quantity
+    return sorted(totals.items())
+
+
+def _variant_filter(product_id, color, size):
+    return (Inventory.product_id == product_id, Inventory.color == color, Inventory.size == size)
+
+
+def reserve_stock(db, items):
+    # Conditional decrement: the UPDATE only matches while enough units remain,
+    # so stock never goes negative and no explicit SELECT ... FOR UPDATE is needed.
+    # The row locks are held until the caller commits or rolls back.
+    for (product_id, color, size), quantity in _variant_totals(items):
+        reserved = db.execute(
+            update(Inventory)
+            .where(*_variant_filter(product_id, color, size), Inventory.quantity >= quantity)
+            .values(quantity=Inventory.quantity - quantity)
+            .returning(Inventory.quantity)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if reserved is not None:
+            continue
+        available = db.execute(
+            select(Inventory.quantity).where(*_variant_filter(product_id, color, size))
+        ).scalar()
+        if available is not None:
+            raise HTTPException(status_code=409, detail={
+                "message": "Insufficient stock",
+                "product_id": str(product_id),
+                "color": color,
+                "size": size,
+                "requested": quantity,
+                "available": available,
+            })
+
+
+def release_stock(db, items):
+    for (product_id, color, size), quantity in _variant_totals(items):
+        db.execute(
+            update(Inventory)
+            .where(*_variant_filter(product_id, color, size))
+            .values(quantity=Inventory.quantity + quantity)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def order_item_variants(order_items):
+    return [(item.product_id, item.color, item.size, item.quantity) for item in order_items]
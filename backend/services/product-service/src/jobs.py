@@ -0,0 +1,202 @@
+#jobs.py
+
+import logging
+import os
+import random
+import traceback
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from sqlalchemy import and_, func, insert, or_, select, update
+
+from models.job import Job
+
+logger = logging.getLogger(__name__)
+
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+JOB_RETRY_BASE_SECONDS = float(os.getenv("JOB_RETRY_BASE_SECONDS", "5"))
+JOB_RETRY_MAX_SECONDS = float(os.getenv("JOB_RETRY_MAX_SECONDS", "3600"))
+# A running job whose worker has been silent this long is assumed lost and claimed again
+JOB_LOCK_TIMEOUT_SECONDS = float(os.getenv("JOB_LOCK_TIMEOUT_SECONDS", "600"))
+
+_handlers = {}
+
+
+class PermanentJobError(Exception):
+    # Raised by a handler when retrying cannot help; the job is dead-lettered at once
+    pass
+
+
+class JobLostError(Exception):
+    # The job was reclaimed by another worker while this one was running it
+    pass
+
+
+@dataclass
+class ClaimedJob:
+    id: Any
+    kind: str
+    payload: dict
+    attempts: int
+    max_attempts: int
+    locked_at: datetime
+    progress: Optional[dict]
+
+
+def job_handler(kind: str):
+    # Registers fn(db, job) for a job kind, where job is a ClaimedJob. The worker
+    # commits after it returns and rolls back if it raises, so a handler's writes
+    # and the job's completion land together. Long handlers may instead commit in
+    # steps through checkpoint(); each step must then be safe to repeat.
+    def register(fn):
+        _handlers[kind] = fn
+        return fn
+    return register
+
+
+def enqueue(db, kind: str, payload: dict, delay_seconds: float = 0, max_attempts: int = JOB_MAX_ATTEMPTS):
+    # Adds the job to the caller's transaction: it becomes visible to workers only
+    # when the request commits, and disappears with it on rollback.
+    values = {"kind": kind, "payload": payload, "max_attempts": max_attempts}
+    if delay_seconds:
+        values["run_at"] = datetime.now(timezone.utc) + timedelta(seconds=delay_seconds)
+    return db.execute(insert(Job).values(**values).returning(Job.id)).scalar_one()
+
+
+def claim(db, batch_size: int) -> list:
+    # Marks up to batch_size due jobs as running and commits. SKIP LOCKED lets any
+    # number of workers poll concurrently without waiting on each other's rows.
+    now = func.now()
+    due = (
+        select(Job.id)
+        .where(or_(
+            and_(Job.status == "queued", Job.run_at <= now),
+            and_(Job.status == "running", Job.locked_at < now - timedelta(seconds=JOB_LOCK_TIMEOUT_SECONDS)),
+        ))
+        .order_by(Job.run_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    claimed = db.execute(
+        update(Job)
+        .where(Job.id.in_(due.scalar_subquery()))
+        .values(status="running", locked_at=now, attempts=Job.attempts + 1)
+        .returning(Job.id, Job.kind, Job.payload, Job.attempts, Job.max_attempts, Job.locked_at, Job.progress)
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.commit()
+    return [ClaimedJob(*row) for row in claimed]
+
+
+def _retry_delay(attempts: int) -> float:
+    # Exponential backoff with jitter
+    delay = min(JOB_RETRY_MAX_SECONDS, JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+def _claimed(job):
+    # Matches the job only while this claim holds it. A job reclaimed after
+    # JOB_LOCK_TIMEOUT_SECONDS has a new attempt count and lock time, so a slow
+    # first worker can no longer complete or reschedule it.
+    return and_(
+        Job.id == job.id, Job.status == "running",
+        Job.attempts == job.attempts, Job.locked_at == job.locked_at,
+    )
+
+
+def _finish(db, job, **values) -> bool:
+    updated = db.execute(
+        update(Job).where(_claimed(job)).values(**values)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not updated:
+        # Also discards the handler's writes when they share this transaction
+        db.rollback()
+        logger.warning("job %s (%s) was reclaimed by another worker; result discarded", job.id, job.kind)
+        return False
+    db.commit()
+    return True
+
+
+def checkpoint(db, job, progress: dict):
+    # Commits the handler's work so far together with its progress, and renews the
+    # claim so a long job is not taken for lost. Raises JobLostError, discarding
+    # the step, if another worker has reclaimed the job.
+    locked_at = db.execute(
+        update(Job).where(_claimed(job))
+        .values(progress=progress, locked_at=func.clock_timestamp())
+        .returning(Job.locked_at)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    if locked_at is None:
+        db.rollback()
+        raise JobLostError(f"job {job.id} was reclaimed by another worker")
+    db.commit()
+    job.locked_at = locked_at
+    job.progress = progress
+
+
+def run_job(db, job):
+    handler = _handlers.get(job.kind)
+    try:
+        if handler is None:
+            raise LookupError(f"No handler registered for job kind {job.kind!r}")
+        handler(db, job)
+        db.flush()
+    except Exception as exc:
+        db.rollback()
+        error = traceback.format_exc(limit=5)
+        if job.attempts >= job.max_attempts or handler is None or isinstance(exc, PermanentJobError):
+            # Dead letter: kept with its last error until an admin retries or removes it
+            logger.error("job %s (%s) dead after %d attempts", job.id, job.kind, job.attempts)
+            _finish(db, job, status="dead", last_error=error, finished_at=func.now())
+        else:
+            logger.warning("job %s (%s) failed, attempt %d", job.id, job.kind, job.attempts)
+            run_at = datetime.now(timezone.utc) + timedelta(seconds=_retry_delay(job.attempts))
+            _finish(db, job, status="queued", last_error=error, run_at=run_at, locked_at=None)
+        return False
+    return _finish(db, job, status="done", finished_at=func.now(), locked_at=None)
+
+
+def run_once(session_factory, batch_size: int = 10) -> int:
+    # Claims and runs one batch; returns the number of jobs claimed
+    db = session_factory()
+    try:
+        jobs = claim(db, batch_size)
+        for job in jobs:
+            run_job(db, job)
+        return len(jobs)
+    finally:
+        db.close()
+
+
+def retry_dead(db, job_id) -> bool:
+    result = db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == "dead")
+        .values(status="queued", attempts=0, run_at=func.now(), finished_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount == 1
+
+
+def queue_stats(db) -> list:
+    rows = db.execute(
+        select(Job.kind, Job.status, func.count().label("jobs"), func.min(Job.run_at).label("oldest"))
+        .group_by(Job.kind, Job.status)
+        .order_by(Job.kind, Job.status)
+    ).mappings().all()
+    return [dict(row) for row in rows]
+
+
+def purge_done(db, older_than_days: float) -> int:
+    result = db.execute(
+        Job.__table__.delete().where(
+            Job.status == "done",
+            Job.finished_at < func.now() - timedelta(days=older_than_days),
+        )
+    )
+    db.commit()
+    return result.rowcount
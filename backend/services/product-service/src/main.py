@@ -1,21 +1,43 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from db import base, session
+from fastapi.responses import PlainTextResponse
 from routes import category, subcategory, subgroup, product, order, admin
 from contextlib import asynccontextmanager
-from db.base import Base
-from auth import get_password_hash
-import uuid
-from sqlalchemy.orm import Session
-from database import get_db
-from db.session import engine
-from models.admin import AdminUser
+from db.session import SessionLocal, DB_ASYNC, engine, async_engine, replica_router
+from database import sticky_primary_middleware
+from search_index import product_search_index
+from password_hashing import password_hasher
+from auth import admin_token_cache
+from product_cache import product_cache
+from metrics import instrument_engine, metrics_middleware, metrics_registry
+import threading
 
+# The schema is managed by Alembic (see migrations/README.md); workers run no DDL on startup.
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The search index loads in the background so the worker can serve right away;
+    # /products/search answers 503 until it is ready. The same thread then keeps
+    # it in sync with writes made by other workers.
+    threading.Thread(target=product_search_index.run, args=(SessionLocal,), daemon=True).start()
+    password_hasher.start()
+    replica_router.start()
+    yield
+    replica_router.stop()
+    product_search_index.stop()
+    password_hasher.shutdown()
 
-base.Base.metadata.create_all(bind=session.engine)
+app = FastAPI(lifespan=lifespan)
 
-app = FastAPI(lifespan=None)
+instrument_engine(engine)
+if async_engine is not None:
+    instrument_engine(async_engine.sync_engine)
+for replica in replica_router.replicas:
+    instrument_engine(replica.engine)
+    if replica.async_engine is not None:
+        instrument_engine(replica.async_engine.sync_engine)
+app.middleware("http")(sticky_primary_middleware)
+app.middleware("http")(metrics_middleware)
 
 origins = [
     "http://localhost:3000",
@@ -29,6 +51,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# In async mode the async read handlers are registered first so they shadow the
+# matching sync routes; everything they don't define falls through to the sync routers.
+if DB_ASYNC:
+    from routes import async_category, async_product, async_order
+    app.include_router(router=async_category.async_category_router, prefix="/categories", tags=["categories"])
+    app.include_router(router=async_product.async_product_router, prefix="/products", tags=["Products"])
+    app.include_router(router=async_order.async_order_router, prefix="/orders", tags=["orders"])
+
 app.include_router(router=category.category_router, prefix="/categories", tags=["categories"])
 app.include_router(router=subcategory.subcategory_router, prefix="/subcategories", tags=["subcategories"])
 app.include_router(router=subgroup.subgroup_router, prefix="/subgroups", tags=["subgroups"])
@@ -40,4 +70,14 @@ app.include_router(router=admin.admin_router, prefix="", tags=["admin"])
 
 @app.get("/")
 def read_root():
-    return {"msg": "Hello World"}
\ No newline at end of file
+    return {"msg": "Hello World"}
+
+# Prometheus scrape target; the counters are per worker process
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def get_metrics():
+    gauges = {"db_pool_checked_out": engine.pool.checkedout()}
+    gauges.update({f"admin_token_cache_{k}": v for k, v in admin_token_cache.stats().items()})
+    gauges.update({f"password_hasher_{k}": v for k, v in password_hasher.stats().items()})
+    gauges.update({f"product_cache_{k}": v for k, v in product_cache.stats().items()})
+    gauges.update({f"db_replica_{k}": v for k, v in replica_router.stats().items()})
+    return PlainTextResponse(metrics_registry.render(gauges), media_type="text/plain; version=0.0.4")
\ No newline at end of file
@@ -0,0 +1,163 @@
+#metrics.py
+
+import bisect
+import os
+import threading
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+# Adds X-Query-Count and Server-Timing headers to every response when enabled
+METRICS_RESPONSE_HEADERS = os.getenv("METRICS_RESPONSE_HEADERS", "false").strip().lower() in ("1", "true", "yes", "on")
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class RequestStats:
+    # SQL work done on behalf of one request. The object is shared by reference
+    # with the threadpool and the middleware task, which receive copies of the context.
+    __slots__ = ("queries", "db_seconds", "rows")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.rows = 0
+
+
+_current_request: ContextVar = ContextVar("request_stats", default=None)
+
+
+# The start time rides on the statement's execution context, so a statement that
+# fails between the two events leaves nothing behind on the pooled connection.
+# context is None only for the dialect's own setup queries, which are not counted.
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_start", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    stats = _current_request.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+        stats.rows += max(cursor.rowcount or 0, 0)
+
+
+def instrument_engine(engine):
+    # Accepts a sync Engine; pass async_engine.sync_engine for the async one
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class _Histogram:
+    __slots__ = ("bounds", "counts", "total", "count")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class _RouteMetrics:
+    __slots__ = ("duration", "queries", "db_seconds", "rows")
+
+    def __init__(self):
+        self.duration = _Histogram(DURATION_BUCKETS)
+        self.queries = _Histogram(QUERY_COUNT_BUCKETS)
+        self.db_seconds = 0.0
+        self.rows = 0
+
+
+class MetricsRegistry:
+    # Per-route request metrics for this worker, keyed by (method, route template, status)
+    # so path parameters do not explode the label space.
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def record(self, method: str, route: str, status: int, duration: float, stats: RequestStats):
+        key = (method, route, str(status))
+        with self._lock:
+            metrics = self._routes.get(key)
+            if metrics is None:
+                metrics = self._routes[key] = _RouteMetrics()
+            metrics.duration.observe(duration)
+            metrics.queries.observe(stats.queries)
+            metrics.db_seconds += stats.db_seconds
+            metrics.rows += stats.rows
+
+    def render(self, gauges: dict = None) -> str:
+        # Prometheus text exposition format 0.0.4
+        with self._lock:
+            routes = sorted(self._routes.items())
+            lines = []
+            self._histogram(lines, "http_request_duration_seconds", "Request latency until the response starts",
+                            [(key, m.duration) for key, m in routes])
+            self._histogram(lines, "http_request_db_queries", "SQL statements executed per request",
+                            [(key, m.queries) for key, m in routes])
+            lines += ["# HELP http_request_db_seconds_total Time spent in SQL statements",
+                      "# TYPE http_request_db_seconds_total counter"]
+            lines += ["http_request_db_seconds_total%s %r" % (_labels(key), m.db_seconds) for key, m in routes]
+            lines += ["# HELP http_request_db_rows_total Rows returned or affected by SQL statements",
+                      "# TYPE http_request_db_rows_total counter"]
+            lines += ["http_request_db_rows_total%s %d" % (_labels(key), m.rows) for key, m in routes]
+        for name, value in (gauges or {}).items():
+            lines += ["# TYPE %s gauge" % name, "%s %r" % (name, float(value))]
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _histogram(lines, name, help_text, series):
+        lines += ["# HELP %s %s" % (name, help_text), "# TYPE %s histogram" % name]
+        for key, histogram in series:
+            cumulative = 0
+            for bound, count in zip(histogram.bounds + ("+Inf",), histogram.counts):
+                cumulative += count
+                lines.append("%s_bucket%s %d" % (name, _labels(key, le=bound), cumulative))
+            lines.append("%s_sum%s %r" % (name, _labels(key), histogram.total))
+            lines.append("%s_count%s %d" % (name, _labels(key), histogram.count))
+
+
+def _labels(key, le=None) -> str:
+    pairs = list(zip(("method", "route", "status"), key))
+    if le is not None:
+        pairs.append(("le", str(le)))
+    return "{%s}" % ",".join('%s="%s"' % (name, value.replace("\\", "\\\\").replace('"', '\\"')) for name, value in pairs)
+
+
+metrics_registry = MetricsRegistry()
+
+
+async def metrics_middleware(request, call_next):
+    # For streaming responses the duration covers the time until the body starts
+    # and the SQL issued while the body is produced is not attributed.
+    stats = RequestStats()
+    token = _current_request.set(stats)
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        _current_request.reset(token)
+    duration = time.perf_counter() - start
+    route = request.scope.get("route")
+    metrics_registry.record(
+        request.method, getattr(route, "path", "unmatched"), response.status_code, duration, stats
+    )
+    if METRICS_RESPONSE_HEADERS:
+        response.headers["X-Query-Count"] = str(stats.queries)
+        response.headers["Server-Timing"] = 'db;dur=%.1f;desc="%d queries", total;dur=%.1f' % (
+            stats.db_seconds * 1000, stats.queries, duration * 1000
+        )
+    return response
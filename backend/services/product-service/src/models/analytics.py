@@ -0,0 +1,44 @@
+# models/analytics.py
+# Sales rollups maintained incrementally by analytics.py. Each logical row is
+# split across ANALYTICS_SHARDS physical rows so concurrent checkouts on the same
+# day or product rarely wait on one another; readers sum over the shards.
+
+from sqlalchemy import Column, String, Float, Integer, Date, SmallInteger, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import UUID
+from db.base import Base
+from models.order import OrderStatus
+
+class DailySales(Base):
+    __tablename__ = "sales_daily"
+    day = Column(Date, primary_key=True)
+    shard = Column(SmallInteger, primary_key=True)
+    orders = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
+
+class StatusCount(Base):
+    __tablename__ = "sales_by_status"
+    status = Column(SQLEnum(OrderStatus, create_type=False), primary_key=True)
+    shard = Column(SmallInteger, primary_key=True)
+    orders = Column(Integer, nullable=False, default=0)
+
+class ProductSales(Base):
+    __tablename__ = "sales_by_product"
+    product_id = Column(UUID(as_uuid=True), primary_key=True)
+    shard = Column(SmallInteger, primary_key=True)
+    name = Column(String, nullable=False)
+    units = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
+
+class CitySales(Base):
+    __tablename__ = "sales_by_city"
+    city = Column(String, primary_key=True)
+    shard = Column(SmallInteger, primary_key=True)
+    orders = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
+
+class CategorySales(Base):
+    __tablename__ = "sales_by_category"
+    main_category_id = Column(UUID(as_uuid=True), primary_key=True)
+    shard = Column(SmallInteger, primary_key=True)
+    units = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
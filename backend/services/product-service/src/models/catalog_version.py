@@ -0,0 +1,22 @@
+# models/catalog_version.py
+
+from sqlalchemy import Column, String, BigInteger, Identity, Index
+from db.base import Base
+
+class CatalogVersion(Base):
+    # One row per catalog table: the number of writing statements already folded
+    # in from catalog_changes by http_cache.compact_catalog_changes. Only the
+    # compaction updates it, so writers never lock it.
+    __tablename__ = "catalog_versions"
+    name = Column(String(63), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
+class CatalogChange(Base):
+    # Append-only log with one row per statement that writes a catalog table,
+    # inserted by a statement trigger (migrations 0012 and 0015)
+    __tablename__ = "catalog_changes"
+    __table_args__ = (
+        Index("ix_catalog_changes_table_name", "table_name"),
+    )
+    id = Column(BigInteger, Identity(always=True), primary_key=True)
+    table_name = Column(String(63), nullable=False)
@@ -1,6 +1,6 @@
 #models/category.py
 import uuid
-from sqlalchemy import Column, String
+from sqlalchemy import Column, String, DateTime, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from db.base import Base
@@ -9,5 +9,8 @@ class MainCategory(Base):
     __tablename__ = "main_categories"
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
     name = Column(String(50), unique=True, nullable=False)
+    # Drives the ETag of HTTP responses (see http_cache.py)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
     #relationship with sub-categories
-    sub_categories = relationship("SubCategory", back_populates="main_category", cascade="all, delete")
\ No newline at end of file
+    # Children are removed by ON DELETE CASCADE in the database, not loaded and deleted by the ORM
+    sub_categories = relationship("SubCategory", back_populates="main_category", cascade="all, delete", passive_deletes=True)
\ No newline at end of file
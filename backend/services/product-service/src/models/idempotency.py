@@ -0,0 +1,13 @@
+# models/idempotency.py
+
+from sqlalchemy import Column, String, Integer, JSON, DateTime, func
+from db.base import Base
+
+class IdempotencyKey(Base):
+    # Outcome of a request sent with an Idempotency-Key header, replayed on retries
+    __tablename__ = "idempotency_keys"
+    key = Column(String(255), primary_key=True)
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(Integer)
+    response = Column(JSON)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), index=True)
@@ -0,0 +1,17 @@
+# models/inventory.py
+
+from sqlalchemy import Column, String, ForeignKey, Float, Integer, DateTime, CheckConstraint, func
+from sqlalchemy.dialects.postgresql import UUID
+from db.base import Base
+
+class Inventory(Base):
+    # Units on hand per product variant. Variants without a row are not stock-tracked.
+    __tablename__ = "inventory"
+    __table_args__ = (
+        CheckConstraint("quantity >= 0", name="ck_inventory_quantity_non_negative"),
+    )
+    product_id = Column(UUID(as_uuid=True), ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    color = Column(String, primary_key=True)
+    size = Column(Float, primary_key=True)
+    quantity = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
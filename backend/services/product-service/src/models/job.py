@@ -0,0 +1,25 @@
+# models/job.py
+
+import uuid
+from sqlalchemy import Column, String, Integer, JSON, Text, DateTime, Index, func
+from sqlalchemy.dialects.postgresql import UUID
+from db.base import Base
+
+class Job(Base):
+    # Durable background job, claimed by worker processes with FOR UPDATE SKIP LOCKED (see jobs.py)
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_status_run_at", "status", "run_at"),
+    )
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
+    kind = Column(String(100), nullable=False)
+    payload = Column(JSON, nullable=False)
+    status = Column(String(20), nullable=False, default="queued")  # queued, running, done or dead
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    run_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    locked_at = Column(DateTime(timezone=True))
+    last_error = Column(Text)
+    progress = Column(JSON)  # written by long handlers through jobs.checkpoint
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    finished_at = Column(DateTime(timezone=True))
@@ -1,9 +1,9 @@
 # models/order.py
 
 import uuid
-from sqlalchemy import Column, String, ForeignKey, Float, JSON, DateTime, Integer, Enum as SQLEnum
+from sqlalchemy import Column, String, ForeignKey, Float, JSON, DateTime, Integer, Index, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from db.base import Base
 from enum import Enum
 
@@ -16,8 +16,16 @@ class OrderStatus(str, Enum):
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        Index("ix_orders_status_order_date", "status", "order_date"),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
     customer = Column(JSON, nullable=False)  # Stores customer info as JSON
+    # Searchable copies of customer fields, kept in sync by _sync_customer_fields
+    customer_email = Column(String, index=True)
+    customer_city = Column(String, index=True)
+    customer_state = Column(String, index=True)
+    customer_zip = Column(String, index=True)
     subtotal = Column(Float, nullable=False)
     tax = Column(Float, nullable=False)
     shipping = Column(Float, nullable=False)
@@ -27,16 +35,26 @@ class Order(Base):
     status = Column(SQLEnum(OrderStatus), default=OrderStatus.pending, nullable=False)
     items = relationship("OrderItem", back_populates="order", cascade="all, delete")
 
+    @validates("customer")
+    def _sync_customer_fields(self, key, customer):
+        self.customer_email = customer.get("email")
+        self.customer_city = customer.get("city")
+        self.customer_state = customer.get("state")
+        self.customer_zip = customer.get("zipCode")
+        return customer
+
 class OrderItem(Base):
     __tablename__ = "order_items"
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
-    order_id = Column(UUID(as_uuid=True), ForeignKey("orders.id"), nullable=False)
-    product_id = Column(UUID(as_uuid=True), ForeignKey("products.id"), nullable=False)
+    order_id = Column(UUID(as_uuid=True), ForeignKey("orders.id"), nullable=False, index=True)
+    product_id = Column(UUID(as_uuid=True), ForeignKey("products.id"), nullable=False, index=True)
     name = Column(String, nullable=False)
     price = Column(Float, nullable=False)
     quantity = Column(Integer, nullable=False)
     color = Column(String, nullable=False)
     size = Column(Float, nullable=False)
     image = Column(String, nullable=False)
+    # The product's main category at checkout; sales rollups are reversed against it
+    main_category_id = Column(UUID(as_uuid=True))
     order = relationship("Order", back_populates="items")
     product = relationship("Product")
\ No newline at end of file
@@ -1,22 +1,36 @@
 #models/product.py
 import uuid
-from sqlalchemy import Column, String, ForeignKey, Float, JSON, Text
+from sqlalchemy import Column, String, ForeignKey, Float, JSON, Text, Index, DateTime, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from db.base import Base
 
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        # Keyset pagination indexes, one per sort order (see pagination.py)
+        Index("ix_products_price_id", "price", "id"),
+        Index("ix_products_title_id", "title", "id"),
+        # Prefix (subtree) lookups on the materialized category path
+        Index("ix_products_category_path", "category_path", postgresql_ops={"category_path": "text_pattern_ops"}),
+        # Delta sync of the search index (see search_index.py)
+        Index("ix_products_updated_at", "updated_at"),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
     title = Column(String(100), nullable=False)
     description = Column(Text)
     price = Column(Float, nullable=False)
-    main_category_id = Column(UUID(as_uuid=True), ForeignKey("main_categories.id"), nullable=False)
-    sub_category_id = Column(UUID(as_uuid=True), ForeignKey("sub_categories.id"), nullable=False)
-    sub_group_id = Column(UUID(as_uuid=True), ForeignKey("sub_group.id"), nullable=False)
+    main_category_id = Column(UUID(as_uuid=True), ForeignKey("main_categories.id", ondelete="CASCADE"), nullable=False, index=True)
+    sub_category_id = Column(UUID(as_uuid=True), ForeignKey("sub_categories.id", ondelete="CASCADE"), nullable=False, index=True)
+    sub_group_id = Column(UUID(as_uuid=True), ForeignKey("sub_group.id", ondelete="CASCADE"), nullable=False, index=True)
     colors = Column(JSON, default=list)       # e.g. ["Red", "Blue", ...]
     sizes = Column(JSON, default=list)        # e.g. [6, 6.5, 7, ...]
     assets = Column(JSON, default=list)       # list of image/video URLs
+    # Maintained by category_paths.refresh_product_paths
+    category_path = Column(String)            # "<main id>/<sub id>/<group id>"
+    breadcrumb = Column(JSON)                 # [{"id": ..., "name": ...}] from main category to subgroup
+    # Drives the ETag of HTTP responses (see http_cache.py)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
 
     main_category = relationship("MainCategory")
     sub_category = relationship("SubCategory")
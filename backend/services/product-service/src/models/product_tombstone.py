@@ -0,0 +1,14 @@
+# models/product_tombstone.py
+
+from sqlalchemy import Column, DateTime, func
+from sqlalchemy.dialects.postgresql import UUID
+from db.base import Base
+
+class ProductTombstone(Base):
+    # One row per deleted product, written by a statement trigger on products
+    # (migration 0014) so cascaded deletes are recorded too. Read by the search
+    # index delta sync and purged after SEARCH_INDEX_TOMBSTONE_RETENTION_SECONDS.
+    __tablename__ = "product_tombstones"
+    # deleted_at leads the key so the sync and the purge are range scans of it
+    deleted_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
+    product_id = Column(UUID(as_uuid=True), primary_key=True)
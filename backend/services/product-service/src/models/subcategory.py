@@ -1,7 +1,7 @@
 #models/subcategory.py
 
 import uuid
-from sqlalchemy import Column, String, ForeignKey
+from sqlalchemy import Column, String, ForeignKey, DateTime, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from db.base import Base
@@ -11,7 +11,9 @@ class SubCategory(Base):
     __tablename__ = "sub_categories"
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
     name = Column(String(50), nullable=False)
-    main_category_id = Column(UUID(as_uuid=True), ForeignKey("main_categories.id"), nullable=False)
+    main_category_id = Column(UUID(as_uuid=True), ForeignKey("main_categories.id", ondelete="CASCADE"), nullable=False, index=True)
+    # Drives the ETag of HTTP responses (see http_cache.py)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
     main_category = relationship("MainCategory", back_populates="sub_categories")
     #each sub category can have many sub-sub-categories
-    sub_group = relationship("SubGroup", back_populates="sub_category", cascade="all, delete")
+    sub_group = relationship("SubGroup", back_populates="sub_category", cascade="all, delete", passive_deletes=True)
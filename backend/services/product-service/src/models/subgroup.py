@@ -1,7 +1,7 @@
 #models/subgroup.py
 
 import uuid
-from sqlalchemy import Column, String, ForeignKey
+from sqlalchemy import Column, String, ForeignKey, DateTime, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from db.base import Base
@@ -10,7 +10,9 @@ class SubGroup(Base):
     __tablename__ = "sub_group"
     id = Column(UUID(as_uuid=True), primary_key=True, nullable=False, default=uuid.uuid4)
     name = Column(String(50), nullable=False)
-    sub_category_id = Column(UUID(as_uuid=True), ForeignKey("sub_categories.id"), nullable=False)
+    sub_category_id = Column(UUID(as_uuid=True), ForeignKey("sub_categories.id", ondelete="CASCADE"), nullable=False, index=True)
+    # Drives the ETag of HTTP responses (see http_cache.py)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
     sub_category = relationship("SubCategory", back_populates="sub_group")
     #Each sub-sub-category has many products.
-    products = relationship("Product", back_populates="sub_group", cascade="all, delete")
\ No newline at end of file
+    products = relationship("Product", back_populates="sub_group", cascade="all, delete", passive_deletes=True)
\ No newline at end of file
@@ -0,0 +1,90 @@
+#pagination.py
+
+import base64
+import json
+from enum import Enum
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+from models.product import Product
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class ProductSort(str, Enum):
+    id = "id"
+    price_asc = "price_asc"
+    price_desc = "price_desc"
+    title_asc = "title_asc"
+    title_desc = "title_desc"
+
+
+# Every sort order ends with Product.id so the key is unique and pages never
+# skip or repeat rows. The flag marks descending orders.
+_SORT_KEYS = {
+    ProductSort.id: ((Product.id,), False),
+    ProductSort.price_asc: ((Product.price, Product.id), False),
+    ProductSort.price_desc: ((Product.price, Product.id), True),
+    ProductSort.title_asc: ((Product.title, Product.id), False),
+    ProductSort.title_desc: ((Product.title, Product.id), True),
+}
+
+# JSON types of the cursor values for each key column; ids are encoded as strings
+_KEY_TYPES = {"id": str, "price": (int, float), "title": str}
+
+
+def encode_cursor(sort: ProductSort, values) -> str:
+    payload = {"s": sort.value, "k": [str(v) if isinstance(v, UUID) else v for v in values]}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: ProductSort) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        columns, _ = _SORT_KEYS[sort]
+        if payload["s"] != sort.value or len(payload["k"]) != len(columns):
+            raise ValueError("cursor does not match sort order")
+        values = list(payload["k"])
+        # A tampered cursor must not reach the database with mistyped key values
+        for column, value in zip(columns, values):
+            if isinstance(value, bool) or not isinstance(value, _KEY_TYPES[column.key]):
+                raise ValueError("cursor key has the wrong type")
+        # The id tie-breaker is always the last key column
+        values[-1] = UUID(values[-1])
+        return values
+    except (ValueError, KeyError, TypeError, AttributeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# Applies keyset filtering and ordering to a Product select. One extra row is
+# fetched so the caller can tell whether a next page exists.
+def paginate_products(stmt, sort: ProductSort, limit: int, cursor: str = None):
+    columns, descending = _SORT_KEYS[sort]
+    if cursor:
+        values = decode_cursor(cursor, sort)
+        key = tuple_(*columns)
+        stmt = stmt.where(key < tuple_(*values) if descending else key > tuple_(*values))
+    order = [c.desc() for c in columns] if descending else list(columns)
+    return stmt.order_by(*order).limit(limit + 1)
+
+
+# Rows come from a select of PRODUCT_SUMMARY_COLUMNS, which include every sort key.
+# Items are plain dicts of column values, ready for orjson.dumps.
+def build_product_page(rows, sort: ProductSort, limit: int) -> dict:
+    items = [row._asdict() for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        columns, _ = _SORT_KEYS[sort]
+        last = rows[limit - 1]
+        next_cursor = encode_cursor(sort, [getattr(last, c.key) for c in columns])
+    return {"items": items, "next_cursor": next_cursor, "limit": limit}
+
+
+def fetch_product_page(db, stmt, sort: ProductSort, limit: int, cursor: str = None) -> dict:
+    rows = db.execute(paginate_products(stmt, sort, limit, cursor)).all()
+    return build_product_page(rows, sort, limit)
@@ -0,0 +1,101 @@
+#password_hashing.py
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_MAX_CONCURRENCY = int(os.getenv("PASSWORD_HASH_MAX_CONCURRENCY", str(PASSWORD_HASH_WORKERS)))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS = float(os.getenv("PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS", "5"))
+
+# Executed in the worker processes
+def _verify(plain_password, hashed_password):
+    return pwd_context.verify(plain_password, hashed_password)
+
+def _hash(password):
+    return pwd_context.hash(password)
+
+class PasswordHasher:
+    # Runs bcrypt in a dedicated process pool so login bursts neither hold the
+    # request threadpool nor the GIL. At most max_concurrency hashes run at once;
+    # further callers wait up to queue_timeout, and once max_pending callers are
+    # queued new ones are rejected with 503 instead of piling up.
+
+    def __init__(self, workers: int, max_concurrency: int, max_pending: int, queue_timeout: float):
+        self.workers = workers
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_pending
+        self.queue_timeout = queue_timeout
+        self._executor = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def start(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_concurrency": self.max_concurrency,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def _overloaded(self):
+        self.rejected += 1
+        return HTTPException(
+            status_code=503,
+            detail="Too many concurrent password checks, please retry",
+            headers={"Retry-After": "1"},
+        )
+
+    async def _run(self, fn, *args):
+        if self.pending >= self.max_pending:
+            raise self._overloaded()
+        self.start()
+        self.pending += 1
+        try:
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                raise self._overloaded()
+            try:
+                result = await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+                self.completed += 1
+                return result
+            finally:
+                self._semaphore.release()
+        finally:
+            self.pending -= 1
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(_verify, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password)
+
+password_hasher = PasswordHasher(
+    PASSWORD_HASH_WORKERS,
+    PASSWORD_HASH_MAX_CONCURRENCY,
+    PASSWORD_HASH_MAX_PENDING,
+    PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,149 @@
+#product_batch.py
+
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from fastapi import HTTPException
+from sqlalchemy import Numeric, delete, exists, func, select, update
+
+from category_paths import in_category
+from models.order import OrderItem
+from models.product import Product
+from product_cache import product_cache
+from search_index import product_search_index
+
+MAX_BATCH_ITEMS = 50000
+REINDEX_CHUNK_SIZE = 1000
+LIST_FIELDS = ("colors", "sizes", "assets")
+
+
+def filter_criteria(batch_filter) -> list:
+    criteria = []
+    if batch_filter.ids is not None:
+        if len(batch_filter.ids) > MAX_BATCH_ITEMS:
+            raise HTTPException(status_code=422, detail=f"At most {MAX_BATCH_ITEMS} ids per request")
+        criteria.append(Product.id.in_(batch_filter.ids))
+    if batch_filter.sub_group_id is not None:
+        criteria.append(Product.sub_group_id == batch_filter.sub_group_id)
+    if batch_filter.sub_category_id is not None:
+        criteria.append(Product.sub_category_id == batch_filter.sub_category_id)
+    if batch_filter.main_category_id is not None:
+        criteria.append(in_category(batch_filter.main_category_id))
+    if not criteria:
+        raise HTTPException(status_code=422, detail="filter must contain ids or a category")
+    return criteria
+
+
+def _values(changes) -> dict:
+    data = changes.model_dump(exclude_unset=True, exclude={"id"})
+    if "price" in data and "price_multiplier" in data:
+        raise HTTPException(status_code=422, detail="Use either price or price_multiplier, not both")
+    values = {field: data[field] for field in ("price", *LIST_FIELDS) if data.get(field) is not None}
+    if data.get("price_multiplier") is not None:
+        values["price"] = func.round((Product.price * data["price_multiplier"]).cast(Numeric), 2)
+    return values
+
+
+def _result(matched_ids, affected_ids, affected_status, failed_status) -> dict:
+    affected = set(affected_ids)
+    results = [
+        {"id": product_id, "status": affected_status if product_id in affected else failed_status}
+        for product_id in matched_ids
+    ]
+    return {
+        "matched": len(matched_ids),
+        "affected": len(affected),
+        "failed": len(matched_ids) - len(affected),
+        "results": results,
+    }
+
+
+def _not_found(requested_ids, matched_ids) -> list:
+    matched = set(matched_ids)
+    return [{"id": product_id, "status": "not_found"} for product_id in dict.fromkeys(requested_ids) if product_id not in matched]
+
+
+def _after_commit(db, updated_ids=(), deleted_ids=()):
+    product_cache.invalidate(*updated_ids, *deleted_ids)
+    for product_id in deleted_ids:
+        product_search_index.remove_product(product_id)
+    updated_ids = list(updated_ids)
+    for start in range(0, len(updated_ids), REINDEX_CHUNK_SIZE):
+        chunk = updated_ids[start:start + REINDEX_CHUNK_SIZE]
+        for product in db.execute(select(Product).where(Product.id.in_(chunk))).scalars():
+            product_search_index.index_product(product)
+
+
+def update_by_filter(db, batch_filter, changes) -> dict:
+    # One UPDATE ... WHERE <filter> RETURNING id for every matching product
+    values = _values(changes)
+    if not values:
+        raise HTTPException(status_code=422, detail="changes must set at least one field")
+    stmt = (
+        update(Product)
+        .where(*filter_criteria(batch_filter))
+        .values(**values, updated_at=func.now())
+        .returning(Product.id)
+        .execution_options(synchronize_session=False)
+    )
+    updated_ids = db.execute(stmt).scalars().all()
+    db.commit()
+    _after_commit(db, updated_ids=updated_ids)
+    report = _result(updated_ids, updated_ids, "updated", "unchanged")
+    if batch_filter.ids is not None:
+        missing = _not_found(batch_filter.ids, updated_ids)
+        report["results"] += missing
+        report["failed"] += len(missing)
+    return report
+
+
+def update_items(db, items) -> dict:
+    # Explicit per-product changes: one query to find the existing ids, then an
+    # executemany UPDATE by primary key per distinct set of fields, in one transaction.
+    if len(items) > MAX_BATCH_ITEMS:
+        raise HTTPException(status_code=422, detail=f"At most {MAX_BATCH_ITEMS} items per request")
+    if any(item.price_multiplier is not None for item in items):
+        raise HTTPException(status_code=422, detail="price_multiplier needs a filter; send price per item instead")
+    latest = {item.id: item for item in items}  # the last entry for an id wins
+    existing = set(db.execute(select(Product.id).where(Product.id.in_(latest))).scalars()) if latest else set()
+
+    now = datetime.now(timezone.utc)
+    rows_by_fields = defaultdict(list)
+    for product_id in existing:
+        values = _values(latest[product_id])
+        if values:
+            rows_by_fields[tuple(sorted(values))].append({"id": product_id, "updated_at": now, **values})
+
+    updated_ids = []
+    for rows in rows_by_fields.values():
+        db.execute(update(Product), rows)
+        updated_ids.extend(row["id"] for row in rows)
+    db.commit()
+    _after_commit(db, updated_ids=updated_ids)
+
+    report = _result(list(existing), updated_ids, "updated", "unchanged")
+    missing = _not_found(latest, existing)
+    report["results"] += missing
+    report["failed"] += len(missing)
+    return report
+
+
+def delete_by_filter(db, batch_filter) -> dict:
+    # Products still referenced by order items are kept and reported; inventory rows
+    # go with their product through ON DELETE CASCADE.
+    criteria = filter_criteria(batch_filter)
+    matched_ids = db.execute(select(Product.id).where(*criteria)).scalars().all()
+    referenced = exists().where(OrderItem.product_id == Product.id)
+    deleted_ids = db.execute(
+        delete(Product).where(*criteria, ~referenced)
+        .returning(Product.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    db.commit()
+    _after_commit(db, deleted_ids=deleted_ids)
+    report = _result(matched_ids, deleted_ids, "deleted", "referenced_by_orders")
+    if batch_filter.ids is not None:
+        missing = _not_found(batch_filter.ids, matched_ids)
+        report["results"] += missing
+        report["failed"] += len(missing)
+    return report
@@ -0,0 +1,254 @@
+#product_bulk.py
+
+import asyncio
+import csv
+import io
+import json
+import queue
+import uuid
+from enum import Enum
+
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from db.session import SessionLocal
+from models.category import MainCategory
+from models.product import Product
+from models.subcategory import SubCategory
+from models.subgroup import SubGroup
+from schemas.product import ProductCreate
+from search_index import IndexedProduct, product_search_index
+from category_paths import refresh_product_paths
+
+IMPORT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+IMPORT_QUEUE_CHUNKS = 16  # request body chunks buffered ahead of the importer
+CSV_FIELDS = [
+    "id", "title", "description", "price", "main_category_id", "sub_category_id",
+    "sub_group_id", "colors", "sizes", "assets",
+]
+LIST_FIELDS = ("colors", "sizes", "assets")
+
+
+class BulkFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+MEDIA_TYPES = {
+    BulkFormat.ndjson: "application/x-ndjson",
+    BulkFormat.csv: "text/csv",
+}
+
+
+class ChunkReader(io.RawIOBase):
+    # File-like view over byte chunks pushed into a queue by the request handler;
+    # None marks the end of the body.
+
+    def __init__(self, chunks: queue.Queue):
+        self._chunks = chunks
+        self._buffer = b""
+        self._eof = False
+
+    def readable(self):
+        return True
+
+    def readinto(self, target):
+        while not self._buffer and not self._eof:
+            chunk = self._chunks.get()
+            if chunk is None:
+                self._eof = True
+            else:
+                self._buffer = chunk
+        size = min(len(target), len(self._buffer))
+        target[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+def _split_list(value):
+    # CSV list cells are either a JSON array or pipe separated ("Red|Blue")
+    value = (value or "").strip()
+    if not value:
+        return []
+    if value.startswith("["):
+        return json.loads(value)
+    return [part.strip() for part in value.split("|") if part.strip()]
+
+
+def _ndjson_rows(text):
+    for number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield number, json.loads(line)
+        except ValueError as exc:
+            yield number, exc
+
+
+def _csv_rows(text):
+    reader = csv.DictReader(text)
+    for number, record in enumerate(reader, start=2):  # row 1 is the header
+        try:
+            row = {key: (value if value != "" else None) for key, value in record.items() if key}
+            for field in LIST_FIELDS:
+                row[field] = _split_list(row.get(field))
+            yield number, row
+        except ValueError as exc:
+            yield number, exc
+
+
+def _batched(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _existing_ids(db, model, ids):
+    if not ids:
+        return set()
+    return set(db.execute(select(model.id).where(model.id.in_(ids))).scalars())
+
+
+class _ImportReport:
+    def __init__(self):
+        self.inserted = 0
+        self.failed = 0
+        self.errors = []
+
+    def fail(self, row, error):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "error": str(error)})
+
+    def as_dict(self):
+        return {
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+def _import_batch(db, batch, seen_titles, report):
+    valid = []
+    for number, row in batch:
+        if isinstance(row, Exception):
+            report.fail(number, row)
+            continue
+        try:
+            valid.append((number, ProductCreate.model_validate(row)))
+        except ValidationError as exc:
+            report.fail(number, exc.errors(include_url=False))
+
+    # One set-based query per foreign key and one for title conflicts
+    mains = _existing_ids(db, MainCategory, {p.main_category_id for _, p in valid})
+    subs = _existing_ids(db, SubCategory, {p.sub_category_id for _, p in valid})
+    groups = _existing_ids(db, SubGroup, {p.sub_group_id for _, p in valid})
+    titles = {p.title for _, p in valid}
+    taken = set(db.execute(select(Product.title).where(Product.title.in_(titles))).scalars()) if titles else set()
+
+    rows, numbers = [], []
+    for number, product in valid:
+        if product.main_category_id not in mains:
+            report.fail(number, "Main category not found")
+        elif product.sub_category_id not in subs:
+            report.fail(number, "Subcategory not found")
+        elif product.sub_group_id not in groups:
+            report.fail(number, "Subgroup not found")
+        elif product.title in taken or product.title in seen_titles:
+            report.fail(number, "Product title already exists")
+        else:
+            seen_titles.add(product.title)
+            rows.append({"id": uuid.uuid4(), **product.model_dump()})
+            numbers.append(number)
+
+    if rows:
+        try:
+            db.execute(insert(Product), rows)  # multi-row INSERT via executemany
+            inserted = Product.id.in_([values["id"] for values in rows])
+            refresh_product_paths(db, inserted)
+            # Indexed as stored: the refresh may have rewritten the category ids
+            indexed = db.execute(
+                select(*(getattr(Product, field) for field in IndexedProduct._fields)).where(inserted)
+            ).all()
+            db.commit()
+        except SQLAlchemyError as exc:
+            db.rollback()
+            for number in numbers:
+                report.fail(number, f"Batch insert failed: {exc.__class__.__name__}")
+            return
+        report.inserted += len(rows)
+        for product in indexed:
+            product_search_index.index_product(product)
+
+
+# Reads NDJSON or CSV from the chunk queue and inserts products in batches of
+# IMPORT_BATCH_SIZE, one transaction per batch. Rows that fail validation, point
+# at missing categories or reuse an existing title are reported and skipped.
+def import_products(chunks: queue.Queue, fmt: BulkFormat) -> dict:
+    text = io.TextIOWrapper(io.BufferedReader(ChunkReader(chunks)), encoding="utf-8", newline="")
+    rows = _csv_rows(text) if fmt == BulkFormat.csv else _ndjson_rows(text)
+    report = _ImportReport()
+    seen_titles = set()
+    db = SessionLocal()
+    try:
+        for batch in _batched(rows, IMPORT_BATCH_SIZE):
+            _import_batch(db, batch, seen_titles, report)
+    finally:
+        db.close()
+    return report.as_dict()
+
+
+# Pumps an async request body into import_products running on the threadpool.
+# The bounded queue throttles the upload to the speed of the database writes.
+async def import_from_stream(body, fmt: BulkFormat) -> dict:
+    chunks = queue.Queue(maxsize=IMPORT_QUEUE_CHUNKS)
+    worker = asyncio.ensure_future(run_in_threadpool(import_products, chunks, fmt))
+
+    async def push(item):
+        while not worker.done():
+            try:
+                chunks.put_nowait(item)
+                return
+            except queue.Full:
+                await asyncio.sleep(0.005)
+
+    try:
+        async for chunk in body:
+            await push(chunk)
+            if worker.done():
+                break
+    finally:
+        await push(None)
+    return await worker
+
+
+def _export_record(product):
+    return {field: getattr(product, field) for field in CSV_FIELDS}
+
+
+def export_ndjson(products):
+    for product in products:
+        yield json.dumps(_export_record(product), default=str, separators=(",", ":")) + "\n"
+
+
+def export_csv(products):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_FIELDS)
+    for product in products:
+        record = _export_record(product)
+        for field in LIST_FIELDS:
+            record[field] = json.dumps(record[field] or [])
+        writer.writerow([record[field] for field in CSV_FIELDS])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
@@ -0,0 +1,263 @@
+#product_cache.py
+
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+
+PRODUCT_CACHE_MAX_ENTRIES = int(os.getenv("PRODUCT_CACHE_MAX_ENTRIES", "10000"))
+PRODUCT_CACHE_TTL_SECONDS = float(os.getenv("PRODUCT_CACHE_TTL_SECONDS", "30"))
+PRODUCT_CACHE_SHARED_TTL_SECONDS = int(os.getenv("PRODUCT_CACHE_SHARED_TTL_SECONDS", "300"))
+PRODUCT_CACHE_REDIS_URL = os.getenv("PRODUCT_CACHE_REDIS_URL")
+# Lifetime of a product's generation counter in the shared cache; must outlast any load
+PRODUCT_CACHE_GENERATION_TTL_SECONDS = 86400
+
+# Shared backends store an entry only if the key's generation is still the one read
+# before the load. Invalidation bumps the generation, so a worker that loaded a row
+# before another worker's update cannot write the old payload back afterwards.
+# Shared keys also carry an epoch, the generation of PRODUCT_CACHE_EPOCH_KEY:
+# clear() bumps it, which moves every product to fresh keys at once.
+PRODUCT_CACHE_EPOCH_KEY = "product:epoch"
+
+
+class InMemoryBackend:
+    # Stand-in for the shared cache with the same interface as RedisBackend.
+    # Useful in tests and single-process deployments.
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {}
+        self._generations = {}
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                self._data.pop(key, None)
+                return None
+            return entry[0]
+
+    def generation(self, key: str) -> int:
+        with self._lock:
+            return self._generations.get(key, 0)
+
+    def set_if_generation(self, key: str, value: bytes, ex: int, generation: int) -> bool:
+        with self._lock:
+            if self._generations.get(key, 0) != generation:
+                return False
+            self._data[key] = (value, time.monotonic() + ex)
+            return True
+
+    def invalidate(self, *keys: str):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+                self._generations[key] = self._generations.get(key, 0) + 1
+
+
+class RedisBackend:
+    # The shared cache on Redis. The compare-and-set runs as a Lua script so the
+    # generation check and the write are atomic.
+
+    _SET_IF_GENERATION = (
+        "if tonumber(redis.call('GET', KEYS[2]) or '0') == tonumber(ARGV[1]) then "
+        "redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3]) return 1 end return 0"
+    )
+
+    def __init__(self, client):
+        self.client = client
+        self._set_if_generation = client.register_script(self._SET_IF_GENERATION)
+
+    @staticmethod
+    def _generation_key(key: str) -> str:
+        return key + ":gen"
+
+    def get(self, key: str):
+        return self.client.get(key)
+
+    def generation(self, key: str) -> int:
+        return int(self.client.get(self._generation_key(key)) or 0)
+
+    def set_if_generation(self, key: str, value: bytes, ex: int, generation: int) -> bool:
+        return bool(self._set_if_generation(keys=[key, self._generation_key(key)], args=[generation, value, ex]))
+
+    def invalidate(self, *keys: str):
+        pipe = self.client.pipeline()
+        for key in keys:
+            pipe.delete(key)
+            pipe.incr(self._generation_key(key))
+            pipe.expire(self._generation_key(key), PRODUCT_CACHE_GENERATION_TTL_SECONDS)
+        pipe.execute()
+
+
+def backend_from_env():
+    if not PRODUCT_CACHE_REDIS_URL:
+        return None
+    import redis  # optional dependency, only needed when a shared cache is configured
+    return RedisBackend(redis.Redis.from_url(PRODUCT_CACHE_REDIS_URL))
+
+
+class ProductCache:
+    # Read-through cache of serialized product payloads, keyed by product id.
+    # Each worker keeps a bounded LRU with a short TTL in front of an optional
+    # shared backend; the TTL bounds how long another worker's local copy can
+    # outlive an invalidation. Concurrent misses for one id are collapsed into a
+    # single load, and a load that overlaps an invalidation is not stored.
+
+    def __init__(self, max_entries: int, ttl_seconds: float, backend=None, shared_ttl_seconds: int = 300):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.backend = backend
+        self.shared_ttl_seconds = shared_ttl_seconds
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # product id -> ((payload, etag), monotonic expiry)
+        self._loading = {}
+        self._loading_async = {}
+        self._version = 0
+        self._epoch = 0
+        self._epoch_read_at = None
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.evictions = 0
+
+    def _key(self, product_id) -> str:
+        # The epoch is re-read once per ttl_seconds, the same bound as local entries
+        now = time.monotonic()
+        if self._epoch_read_at is None or now - self._epoch_read_at >= self.ttl_seconds:
+            self._epoch = self.backend.generation(PRODUCT_CACHE_EPOCH_KEY)
+            self._epoch_read_at = now
+        return f"product:{self._epoch}:{product_id}"
+
+    def get(self, product_id):
+        with self._lock:
+            entry = self._entries.get(product_id)
+            if entry is not None and entry[1] > time.monotonic():
+                self._entries.move_to_end(product_id)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[product_id]
+        if self.backend is not None:
+            raw = self.backend.get(self._key(product_id))
+            if raw is not None:
+                etag, _, payload = raw.partition(b"\n")
+                value = (payload, etag.decode())
+                self._put_local(product_id, value)
+                with self._lock:
+                    self.hits += 1
+                return value
+        return None
+
+    def _put_local(self, product_id, value, version: int = None):
+        with self._lock:
+            if version is not None and version != self._version:
+                return False
+            self._entries[product_id] = (value, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(product_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    def _shared_generation(self, product_id):
+        # (key, generation) to store a load under, read before it starts
+        if self.backend is None:
+            return None, None
+        key = self._key(product_id)
+        return key, self.backend.generation(key)
+
+    def _store(self, product_id, value, version: int, key, generation):
+        # Shared first: if another worker invalidated the product during the load,
+        # the payload may predate its write and is kept out of both caches
+        if value is None:
+            return
+        if self.backend is not None:
+            payload, etag = value
+            stored = self.backend.set_if_generation(
+                key, etag.encode() + b"\n" + payload, self.shared_ttl_seconds, generation
+            )
+            if not stored:
+                return
+        self._put_local(product_id, value, version)
+
+    def get_or_load(self, product_id, load):
+        # load() returns (payload bytes, etag), or None if the product does not exist
+        value = self.get(product_id)
+        if value is not None:
+            return value
+        with self._lock:
+            lock = self._loading.setdefault(product_id, threading.Lock())
+        with lock:
+            value = self.get(product_id)
+            if value is None:
+                with self._lock:
+                    self.misses += 1
+                    self.loads += 1
+                version = self._version
+                key, generation = self._shared_generation(product_id)
+                value = load()
+                self._store(product_id, value, version, key, generation)
+        with self._lock:
+            self._loading.pop(product_id, None)
+        return value
+
+    async def get_or_load_async(self, product_id, load):
+        value = self.get(product_id)
+        if value is not None:
+            return value
+        lock = self._loading_async.setdefault(product_id, asyncio.Lock())
+        async with lock:
+            value = self.get(product_id)
+            if value is None:
+                with self._lock:
+                    self.misses += 1
+                    self.loads += 1
+                version = self._version
+                key, generation = self._shared_generation(product_id)
+                value = await load()
+                self._store(product_id, value, version, key, generation)
+        self._loading_async.pop(product_id, None)
+        return value
+
+    def invalidate(self, *product_ids):
+        with self._lock:
+            self._version += 1
+            for product_id in product_ids:
+                self._entries.pop(product_id, None)
+        if self.backend is not None and product_ids:
+            self.backend.invalidate(*(self._key(product_id) for product_id in product_ids))
+
+    def clear(self):
+        # Drops every product. Other workers switch to the new shared epoch within
+        # ttl_seconds, as they drop their local entries.
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+        if self.backend is not None:
+            self.backend.invalidate(PRODUCT_CACHE_EPOCH_KEY)
+            self._epoch_read_at = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "shared_backend": self.backend is not None,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "loads": self.loads,
+                "evictions": self.evictions,
+            }
+
+
+product_cache = ProductCache(
+    PRODUCT_CACHE_MAX_ENTRIES,
+    PRODUCT_CACHE_TTL_SECONDS,
+    backend=backend_from_env(),
+    shared_ttl_seconds=PRODUCT_CACHE_SHARED_TTL_SECONDS,
+)
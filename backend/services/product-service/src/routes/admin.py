@@ -1,31 +1,61 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, selectinload, sessionmaker
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from uuid import UUID
-from typing import List
-from database import get_db
+from typing import List, Optional
+from database import get_db, get_primary_db, get_session_factory
 from models.admin import AdminUser
-from models.order import Order
+from models.order import Order, OrderStatus
 from models.category import MainCategory
 from models.subcategory import SubCategory
 from models.product import Product
 from models.subgroup import SubGroup
+from models.inventory import Inventory
+from models.analytics import DailySales, StatusCount, ProductSales, CitySales, CategorySales
 from schemas.admin import AdminLogin, AdminCreate, AdminRead
-from schemas.order import OrderSummary
+from schemas.order import OrderSummary, ORDER_SUMMARY_COLUMNS, order_summary_record
 from schemas.category import CreateCategory, UpdateCategory, ReadCategory
 from schemas.subcategory import CreateSubCategory, UpdateSubCategory, ReadSubCategory
 from schemas.subgroup import CreateSubGroup, UpdateSubGroup, ReadSubGroup
-from schemas.product import ProductOut, ProductCreate, ProductSummary, ProductUpdate
-from auth import verify_password, get_password_hash, create_access_token, get_current_admin
-from datetime import timedelta
+from schemas.analytics import DailyRevenue, StatusTotal, ProductTotal, CityTotal, CategoryTotal
+from schemas.inventory import InventoryLevel, InventoryRead
+from schemas.product import (
+    ProductOut, ProductCreate, ProductPage, ProductUpdate, ProductImportResult,
+    ProductBatchUpdate, ProductBatchDelete, ProductBatchResult, PRODUCT_SUMMARY_COLUMNS,
+)
+from product_batch import update_by_filter, update_items, delete_by_filter
+from product_bulk import BulkFormat, MEDIA_TYPES, import_from_stream, export_csv, export_ndjson
+from streaming import StreamFormat, coalesce, stream_rows, stream_scalars, streaming_response
+from pagination import ProductSort, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, fetch_product_page
+from catalog_cache import category_tree_cache
+from search_index import product_search_index
+from analytics import record_order_deleted
+from inventory import release_stock, order_item_variants
+from product_cache import product_cache
+from category_delete import delete_category_now, enqueue_category_delete, job_progress
+from jobs import queue_stats, retry_dead
+from models.job import Job
+from category_paths import CATEGORY_FIELDS, refresh_product_paths
+from routes.product import load_product_payload
+from password_hashing import password_hasher
+from auth import create_access_token, get_current_admin, AdminPrincipal, admin_token_cache
+from datetime import date, timedelta
 
 admin_router = APIRouter(prefix="/admin", tags=["admin"])
 
 # Login Route (Unprotected)
+# bcrypt runs in the password hasher's process pool; only the short DB lookup uses the threadpool.
 @admin_router.post("/login")
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    admin = db.query(AdminUser).filter(AdminUser.email == form_data.username).first()
-    if not admin or not verify_password(form_data.password, admin.password):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    admin = await run_in_threadpool(
+        lambda: db.query(AdminUser).filter(AdminUser.email == form_data.username).first()
+    )
+    if not admin or not await password_hasher.verify(form_data.password, admin.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -39,49 +69,129 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
 
 # Create New Admin (Protected)
 @admin_router.post("/admins", response_model=AdminRead)
-def create_admin(
+async def create_admin(
     admin_data: AdminCreate,
     db: Session = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin)
+    current_admin: AdminPrincipal = Depends(get_current_admin)
 ):
-    existing_admin = db.query(AdminUser).filter(AdminUser.email == admin_data.email).first()
+    existing_admin = await run_in_threadpool(
+        lambda: db.query(AdminUser).filter(AdminUser.email == admin_data.email).first()
+    )
     if existing_admin:
         raise HTTPException(status_code=400, detail="Email already registered")
-    hashed_password = get_password_hash(admin_data.password)
+    hashed_password = await password_hasher.hash(admin_data.password)
     new_admin = AdminUser(email=admin_data.email, password=hashed_password)
-    db.add(new_admin)
-    db.commit()
-    db.refresh(new_admin)
-    return new_admin
+
+    def save():
+        db.add(new_admin)
+        db.commit()
+        db.refresh(new_admin)
+        return new_admin
+    return await run_in_threadpool(save)
+
+# Auth cache metrics (Protected)
+@admin_router.get("/auth/cache", response_model=dict)
+def get_auth_cache_stats(current_admin: AdminPrincipal = Depends(get_current_admin)):
+    return admin_token_cache.stats()
+
+@admin_router.get("/auth/hasher", response_model=dict)
+def get_password_hasher_stats(current_admin: AdminPrincipal = Depends(get_current_admin)):
+    return password_hasher.stats()
 
 # Get All Orders (Protected)
 @admin_router.get("/orders", response_model=List[OrderSummary])
 def get_all_orders(
+    stream: Optional[StreamFormat] = None,
     db: Session = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin)
+    session_factory: sessionmaker = Depends(get_session_factory),
+    current_admin: AdminPrincipal = Depends(get_current_admin)
 ):
-    return db.query(Order).all()
+    if stream:
+        rows = stream_rows(select(*ORDER_SUMMARY_COLUMNS), session_factory)
+        return streaming_response(rows, order_summary_record, stream)
+    # Trusted column values go straight to orjson, which encodes UUIDs, datetimes and enums natively
+    orders = [row._asdict() for row in db.execute(select(*ORDER_SUMMARY_COLUMNS))]
+    return Response(orjson.dumps(orders), media_type="application/json")
 
 # Delete Order (Protected)
 @admin_router.delete("/orders/{order_id}", response_model=dict)
 def delete_order(
     order_id: UUID,
     db: Session = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin)
+    current_admin: AdminPrincipal = Depends(get_current_admin)
 ):
-    order = db.query(Order).filter(Order.id == order_id).first()
+    order = db.query(Order).options(selectinload(Order.items)).filter(Order.id == order_id).first()
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
+    # Like cancelling: the units it still holds go back to stock
+    if order.status != OrderStatus.cancelled:
+        release_stock(db, order_item_variants(order.items))
+    record_order_deleted(db, order)
     db.delete(order)
     db.commit()
     return {"message": f"Order {order_id} deleted successfully"}
 
+# Category deletes run as one statement: the database cascades to subcategories,
+# subgroups and products without the ORM loading them. With ?background=true the
+# products are removed in batches by a queued job instead, polled at /admin/jobs/{job_id}.
+def start_category_delete(db: Session, field: str, category_id: UUID):
+    job_id = enqueue_category_delete(db, field, category_id)
+    db.commit()
+    return JSONResponse(
+        status_code=202,
+        content={"id": str(job_id), "status": "queued"},
+        headers={"Location": f"/admin/jobs/{job_id}"},
+    )
+
+@admin_router.get("/jobs/{job_id}", response_model=dict)
+def get_job(
+    job_id: UUID,
+    db: Session = Depends(get_db),
+    current_admin: AdminPrincipal = Depends(get_current_admin)
+):
+    job = db.get(Job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_progress(job)
+
+# Durable job queue, drained by worker.py processes
+@admin_router.get("/queue/stats", response_model=List[dict])
+def get_queue_stats(
+    db: Session = Depends(get_db),
+    current_admin: AdminPrincipal = Depends(get_current_admin)
+):
+    return queue_stats(db)
+
+@admin_router.get("/queue/dead", response_model=List[dict])
+def list_dead_jobs(
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_admin: AdminPrincipal = Depends(get_current_admin)
+):
+    rows = db.execute(
+        select(Job.id, Job.kind, Job.payload, Job.attempts, Job.last_error, Job.created_at, Job.finished_at)
+        .where(Job.status == "dead")
+        .order_by(Job.finished_at.desc())
+        .limit(limit)
+    ).mappings().all()
+    return [dict(row) for row in rows]
+
+@admin_router.post("/queue/{job_id}/retry", response_model=dict)
+def retry_dead_job(
+    job_id: UUID,
+    db: Session = Depends(get_db),
+    current_admin: AdminPrincipal = Depends(get_current_admin)
+):
+    if not retry_dead(db, job_id):
+        raise HTTPException(status_code=404, detail="Dead job not found")
+    return {"message": f"Job {job_id} queued for retry"}
+
 # Main Category Routes (Protected)
 @admin_router.post("/categories", response_model=ReadCategory)
 def create_main_category(
     category_data: CreateCategory,
     db: Session = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin)
+    current_admin: AdminPrincipal = Depends(get_current_admin)
 ):
     existing_category = db.query(MainCategory).filter(MainCategory.name == category_data.name).first()
     if existing_category:
@@ -90,6 +200,7 @@ def create_main_category(
     db.add(new_category)
     db.commit()
     db.refresh(new_category)
+    category_tree_cache.invalidate()
     return new_category
 
 @admin_router.put("/categories/{category_id}", response_model=ReadCategory)
@@ -97,7 +208,7 @@ def update_main_category(
     category_id: UUID,
     category_data: UpdateCategory,
     db: Session = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin)
+    current_admin: AdminPrincipal = Depends(get_current_admin)
 ):
     category = db.query(MainCategory).filter(MainCategory.id == category_id).first()
     if not category:
@@ -107,21 +218,27 @@ def update_main_category(
         if existing_category:
             raise HTTPException(status_code=400, detail="Main category name already exists")
         category.name = category_data.name
+    product_ids = refresh_product_paths(db, MainCategory.id == category_id)
     db.commit()
     db.refresh(category)
+    product_cache.invalidate(*product_ids)
+    category_tree_cache.invalidate()
     return category
 
 @admin_router.delete("/categories/{category_id}", response_model=dict)
 def delete_main_category(
     category_id: UUID,
+    background: bool = False,
     db: Session = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin)
+    current_admin: AdminPrincipal = Depends(get_current_admin)
 ):
     category = db.query(MainCategory).filter(MainCategory.id == category_id).first()
     if not category:
         raise HTTPException(status_code=404, detail="Main category not found")
-    db.delete(category)
-    db.commit()
+    if background:
+        return start_category_delete(db, "main", category_id)
+    delete_category_now(db, "main", category)
+    category_tree_cache.invalidate()
     return {"message": f"Main category {category_id} deleted successfully"}
 
 # SubCategory Routes (Protected)
@@ -129,7 +246,7 @@ def delete_main_category(
 def create_sub_category(
     category_data: CreateSubCategory,
     db: Session = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin)
+    current_admin: AdminPrincipal = Depends(get_current_admin)
 ):
     main_category = db.query(MainCategory).filter(MainCategory.id == category_data.main_category_id).first()
     if not main_category:
@@ -138,6 +255,7 @@ def create_sub_category(
     db.add(new_category)
     db.commit()
     db.refresh(new_category)
+    category_tree_cache.invalidate()
     return new_category
 
 @admin_router.put("/subcategories/{category_id}", response_model=ReadSubCategory)
@@ -145,7 +263,7 @@ def update_sub_category(
     category_id: UUID,
     category_data: UpdateSubCategory,
     db: Session = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin)
+    current_admin: AdminPrincipal = Depends(get_current_admin)
 ):
     category = db.query(SubCategory).filter(SubCategory.id == category_id).first()
     if not category:
@@ -157,21 +275,27 @@ def update_sub_category(
         if not main_category:
             raise HTTPException(status_code=404, detail="Main category not found")
         category.main_category_id = category_data.main_category_id
+    product_ids = refresh_product_paths(db, SubCategory.id == category_id)
     db.commit()
     db.refresh(category)
+    product_cache.invalidate(*product_ids)
+    category_tree_cache.invalidate()
     return category
 
 @admin_router.delete("/subcategories/{category_id}", response_model=dict)
 def delete_sub_category(
     category_id: UUID,
+    background: bool = False,
     db: Session = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin)
+    current_admin: AdminPrincipal = Depends(get_current_admin)
 ):
     category = db.query(SubCategory).filter(SubCategory.id == category_id).first()
     if not category:
         raise HTTPException(status_code=404, detail="Subcategory not found")
-    db.delete(category)
-    db.commit()
+    if background:
+        return start_category_delete(db, "sub", category_id)
+    delete_category_now(db, "sub", category)
+    category_tree_cache.invalidate()
     return {"message": f"Subcategory {category_id} deleted successfully"}
 
 # SubGroup Routes (Protected)
@@ -179,7 +303,7 @@ def delete_sub_category(
 def create_sub_group(
     group_data: CreateSubGroup,
     db: Session = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin)
+    current_admin: AdminPrincipal = Depends(get_current_admin)
 ):
     sub_category = db.query(SubCategory).filter(SubCategory.id == group_data.sub_category_id).first()
     if not sub_category:
@@ -188,6 +312,7 @@ def create_sub_group(
     db.add(new_group)
     db.commit()
     db.refresh(new_group)
+    category_tree_cache.invalidate()
     return new_group
 
 @admin_router.put("/subgroups/{group_id}", response_model=ReadSubGroup)
@@ -195,7 +320,7 @@ def update_sub_group(
     group_id: UUID,
     group_data: UpdateSubGroup,
     db: Session = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin)
+    current_admin: AdminPrincipal = Depends(get_current_admin)
 ):
     group = db.query(SubGroup).filter(SubGroup.id == group_id).first()
     if not group:
@@ -207,21 +332,27 @@ def update_sub_group(
         if not sub_category:
             raise HTTPException(status_code=404, detail="Subcategory not found")
         group.sub_category_id = group_data.sub_category_id
+    product_ids = refresh_product_paths(db, SubGroup.id == group_id)
     db.commit()
     db.refresh(group)
+    product_cache.invalidate(*product_ids)
+    category_tree_cache.invalidate()
     return group
 
 @admin_router.delete("/subgroups/{group_id}", response_model=dict)
 def delete_sub_group(
     group_id: UUID,
+    background: bool = False,
     db: Session = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin)
+    current_admin: AdminPrincipal = Depends(get_current_admin)
 ):
     group = db.query(SubGroup).filter(SubGroup.id == group_id).first()
     if not group:
         raise HTTPException(status_code=404, detail="Subgroup not found")
-    db.delete(group)
-    db.commit()
+    if background:
+        return start_category_delete(db, "group", group_id)
+    delete_category_now(db, "group", group)
+    category_tree_cache.invalidate()
     return {"message": f"Subgroup {group_id} deleted successfully"}
 
 
@@ -230,7 +361,7 @@ def delete_sub_group(
 def create_product(
     product_data: ProductCreate,
     db: Session = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin)
+    current_admin: AdminPrincipal = Depends(get_current_admin)
 ):
     # Validate foreign keys
     main_category = db.query(MainCategory).filter(MainCategory.id == product_data.main_category_id).first()
@@ -251,34 +382,91 @@ def create_product(
     # Create product
     new_product = Product(**product_data.model_dump())
     db.add(new_product)
+    db.flush()
+    refresh_product_paths(db, Product.id == new_product.id)
     db.commit()
     db.refresh(new_product)
+    product_search_index.index_product(new_product)
     return new_product
 
-@admin_router.get("/products", response_model=List[ProductSummary])
+@admin_router.get("/products", response_model=ProductPage)
 def get_all_products(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    sort: ProductSort = ProductSort.id,
+    db: Session = Depends(get_db),
+    current_admin: AdminPrincipal = Depends(get_current_admin)
+):
+    page = fetch_product_page(db, select(*PRODUCT_SUMMARY_COLUMNS), sort, limit, cursor)
+    return Response(orjson.dumps(page), media_type="application/json")
+
+# Bulk import: NDJSON (one product per line) or CSV with a header row, streamed in the request body
+@admin_router.post("/products/import", response_model=ProductImportResult)
+async def import_products(
+    request: Request,
+    format: Optional[BulkFormat] = None,
+    current_admin: AdminPrincipal = Depends(get_current_admin)
+):
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        format = BulkFormat.csv if "csv" in content_type else BulkFormat.ndjson
+    return await import_from_stream(request.stream(), format)
+
+@admin_router.get("/products/export")
+def export_products(
+    format: BulkFormat = BulkFormat.ndjson,
+    session_factory: sessionmaker = Depends(get_session_factory),
+    current_admin: AdminPrincipal = Depends(get_current_admin)
+):
+    products = stream_scalars(select(Product).order_by(Product.id), session_factory)
+    encode = export_csv if format == BulkFormat.csv else export_ndjson
+    return StreamingResponse(
+        coalesce(encode(products)),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="products.{format.value}"'},
+    )
+
+# Batch mutations: set-based SQL in one transaction, with a result per product
+@admin_router.post("/products/batch/update", response_model=ProductBatchResult)
+def batch_update_products(
+    batch: ProductBatchUpdate,
+    db: Session = Depends(get_db),
+    current_admin: AdminPrincipal = Depends(get_current_admin)
+):
+    if batch.items is not None:
+        if batch.filter is not None or batch.changes is not None:
+            raise HTTPException(status_code=422, detail="Send either items or filter with changes")
+        return update_items(db, batch.items)
+    if batch.filter is None or batch.changes is None:
+        raise HTTPException(status_code=422, detail="filter and changes are required without items")
+    return update_by_filter(db, batch.filter, batch.changes)
+
+@admin_router.post("/products/batch/delete", response_model=ProductBatchResult)
+def batch_delete_products(
+    batch: ProductBatchDelete,
     db: Session = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin)
+    current_admin: AdminPrincipal = Depends(get_current_admin)
 ):
-    return db.query(Product).all()
+    return delete_by_filter(db, batch.filter)
 
 @admin_router.get("/products/{product_id}", response_model=ProductOut)
 def get_product(
     product_id: UUID,
-    db: Session = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin)
+    db: Session = Depends(get_primary_db),
+    current_admin: AdminPrincipal = Depends(get_current_admin)
 ):
-    product = db.query(Product).filter(Product.id == product_id).first()
-    if not product:
+    cached = product_cache.get_or_load(product_id, lambda: load_product_payload(db, product_id))
+    if cached is None:
         raise HTTPException(status_code=404, detail="Product not found")
-    return product
+    payload, etag = cached
+    return Response(content=payload, media_type="application/json", headers={"ETag": etag})
 
 @admin_router.put("/products/{product_id}", response_model=ProductOut)
 def update_product(
     product_id: UUID,
     product_data: ProductUpdate,
     db: Session = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin)
+    current_admin: AdminPrincipal = Depends(get_current_admin)
 ):
     product = db.query(Product).filter(Product.id == product_id).first()
     if not product:
@@ -308,19 +496,134 @@ def update_product(
     updates = product_data.model_dump(exclude_unset=True)
     for field, value in updates.items():
         setattr(product, field, value)
+    if updates.keys() & CATEGORY_FIELDS:
+        refresh_product_paths(db, Product.id == product_id)
     db.commit()
     db.refresh(product)
+    product_cache.invalidate(product_id)
+    product_search_index.index_product(product)
     return product
 
 @admin_router.delete("/products/{product_id}", response_model=dict)
 def delete_product(
     product_id: UUID,
     db: Session = Depends(get_db),
-    current_admin: AdminUser = Depends(get_current_admin)
+    current_admin: AdminPrincipal = Depends(get_current_admin)
 ):
     product = db.query(Product).filter(Product.id == product_id).first()
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     db.delete(product)
     db.commit()
-    return {"message": f"Product {product_id} deleted successfully"}
\ No newline at end of file
+    product_cache.invalidate(product_id)
+    product_search_index.remove_product(product_id)
+    return {"message": f"Product {product_id} deleted successfully"}
+
+# Inventory Routes (Protected)
+@admin_router.get("/inventory/{product_id}", response_model=List[InventoryRead])
+def get_inventory(
+    product_id: UUID,
+    db: Session = Depends(get_db),
+    current_admin: AdminPrincipal = Depends(get_current_admin)
+):
+    return db.query(Inventory).filter(Inventory.product_id == product_id).order_by(Inventory.color, Inventory.size).all()
+
+@admin_router.put("/inventory/{product_id}", response_model=List[InventoryRead])
+def set_inventory(
+    product_id: UUID,
+    levels: List[InventoryLevel],
+    db: Session = Depends(get_db),
+    current_admin: AdminPrincipal = Depends(get_current_admin)
+):
+    # Sets absolute stock levels for the listed variants; variants not listed are left as they are
+    if db.query(Product.id).filter(Product.id == product_id).first() is None:
+        raise HTTPException(status_code=404, detail="Product not found")
+    if levels:
+        # One row per variant: ON CONFLICT cannot update the same row twice in one statement
+        rows = {(level.color, level.size): {"product_id": product_id, **level.model_dump()} for level in levels}
+        stmt = pg_insert(Inventory).values(list(rows.values()))
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[Inventory.product_id, Inventory.color, Inventory.size],
+            set_={"quantity": stmt.excluded.quantity, "updated_at": func.now()},
+        ))
+        db.commit()
+    return get_inventory(product_id, db, current_admin)
+
+# Analytics Routes (Protected)
+# Served from the rollup tables maintained by analytics.py; each query reads at most
+# ANALYTICS_SHARDS rows per result row, independent of the number of orders.
+@admin_router.get("/analytics/revenue", response_model=List[DailyRevenue])
+def get_daily_revenue(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    db: Session = Depends(get_db),
+    current_admin: AdminPrincipal = Depends(get_current_admin)
+):
+    end = end or date.today()
+    start = start or end - timedelta(days=29)
+    stmt = (
+        select(DailySales.day, func.sum(DailySales.orders).label("orders"), func.sum(DailySales.revenue).label("revenue"))
+        .where(DailySales.day.between(start, end))
+        .group_by(DailySales.day)
+        .order_by(DailySales.day)
+    )
+    return db.execute(stmt).mappings().all()
+
+@admin_router.get("/analytics/status", response_model=List[StatusTotal])
+def get_orders_by_status(
+    db: Session = Depends(get_db),
+    current_admin: AdminPrincipal = Depends(get_current_admin)
+):
+    stmt = select(StatusCount.status, func.sum(StatusCount.orders).label("orders")).group_by(StatusCount.status)
+    return db.execute(stmt).mappings().all()
+
+@admin_router.get("/analytics/top-products", response_model=List[ProductTotal])
+def get_top_products(
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_admin: AdminPrincipal = Depends(get_current_admin)
+):
+    units = func.sum(ProductSales.units)
+    stmt = (
+        select(ProductSales.product_id, func.max(ProductSales.name).label("name"),
+               units.label("units"), func.sum(ProductSales.revenue).label("revenue"))
+        .group_by(ProductSales.product_id)
+        .having(units > 0)
+        .order_by(units.desc())
+        .limit(limit)
+    )
+    return db.execute(stmt).mappings().all()
+
+@admin_router.get("/analytics/cities", response_model=List[CityTotal])
+def get_sales_by_city(
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_admin: AdminPrincipal = Depends(get_current_admin)
+):
+    revenue = func.sum(CitySales.revenue)
+    stmt = (
+        select(CitySales.city, func.sum(CitySales.orders).label("orders"), revenue.label("revenue"))
+        .group_by(CitySales.city)
+        .having(func.sum(CitySales.orders) > 0)
+        .order_by(revenue.desc())
+        .limit(limit)
+    )
+    return db.execute(stmt).mappings().all()
+
+@admin_router.get("/analytics/categories", response_model=List[CategoryTotal])
+def get_sales_by_category(
+    db: Session = Depends(get_db),
+    current_admin: AdminPrincipal = Depends(get_current_admin)
+):
+    totals = (
+        select(CategorySales.main_category_id, func.sum(CategorySales.units).label("units"),
+               func.sum(CategorySales.revenue).label("revenue"))
+        .group_by(CategorySales.main_category_id)
+        .subquery()
+    )
+    stmt = (
+        select(totals.c.main_category_id, MainCategory.name, totals.c.units, totals.c.revenue)
+        .outerjoin(MainCategory, MainCategory.id == totals.c.main_category_id)
+        .order_by(totals.c.revenue.desc())
+    )
+    return db.execute(stmt).mappings().all()
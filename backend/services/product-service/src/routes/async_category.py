@@ -0,0 +1,56 @@
+#routes/async_category.py
+# Async read handlers for /categories, mounted ahead of routes/category.py when DB_ASYNC=1.
+
+import json
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from schemas import category
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from database import get_async_db, get_async_primary_db
+from models.category import MainCategory
+from models.subcategory import SubCategory
+from models.subgroup import SubGroup
+from typing import List
+from catalog_cache import category_tree_cache
+from http_cache import etag_matches, version_etag, catalog_headers, not_modified, table_version_stmt
+
+async_category_router = APIRouter()
+
+@async_category_router.get("/", response_model=List[category.ReadCategory])
+async def get_all_categories(request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+    version = (await db.execute(table_version_stmt(MainCategory))).one()
+    etag = version_etag("categories", *version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(catalog_headers(etag))
+    result = await db.execute(select(MainCategory))
+    return result.scalars().all()
+
+@async_category_router.get("/tree", response_model=List[category.ReadFullNestedCategory])
+async def get_full_category_tree(request: Request, db: AsyncSession = Depends(get_async_primary_db)):
+    async def load_version():
+        return (await db.execute(table_version_stmt(MainCategory, SubCategory, SubGroup))).scalar()
+
+    payload, etag = await category_tree_cache.get_or_build_async(lambda: build_category_tree(db), load_version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return Response(content=payload, media_type="application/json", headers=catalog_headers(etag))
+
+async def build_category_tree(db: AsyncSession) -> bytes:
+    result = await db.execute(
+        select(MainCategory).options(
+            joinedload(MainCategory.sub_categories).joinedload(SubCategory.sub_group)
+        )
+    )
+    main_categories = result.unique().scalars().all()
+    tree = [category.ReadFullNestedCategory.model_validate(main).model_dump(mode="json") for main in main_categories]
+    return json.dumps(tree, separators=(",", ":")).encode()
+
+@async_category_router.get("/{category_id:uuid}", response_model=category.ReadCategory)
+async def get_category(category_id: UUID, db: AsyncSession = Depends(get_async_db)):
+    db_category = await db.get(MainCategory, category_id)
+    if db_category is None:
+        raise HTTPException(status_code=404, detail="Category not found")
+    return db_category
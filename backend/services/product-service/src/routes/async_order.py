@@ -0,0 +1,53 @@
+#routes/async_order.py
+# Async read handlers for /orders, mounted ahead of routes/order.py when DB_ASYNC=1.
+# Async sessions cannot lazy-load, so Order.items is always loaded eagerly here.
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload, sessionmaker
+from uuid import UUID
+from typing import List, Optional
+from database import get_async_db, get_session_factory
+from models.order import Order, OrderStatus
+from schemas.order import ReadOrder, OrderSummary, ORDER_SUMMARY_COLUMNS, order_summary_record
+from streaming import StreamFormat, stream_rows, streaming_response
+from routes.order import order_filters, parse_order_ids
+
+async_order_router = APIRouter()
+
+@async_order_router.get("/", response_model=List[OrderSummary])
+async def get_orders(
+    db: AsyncSession = Depends(get_async_db),
+    status: Optional[OrderStatus] = None,
+    area: Optional[str] = None,
+    state: Optional[str] = None,
+    email: Optional[str] = None,
+    zip_code: Optional[str] = None,
+    stream: Optional[StreamFormat] = None,
+    session_factory: sessionmaker = Depends(get_session_factory),
+):
+    filters = order_filters(status, area, state, email, zip_code)
+    if stream:
+        # The streaming body is produced on the threadpool from its own sync session
+        stmt = select(*ORDER_SUMMARY_COLUMNS).where(*filters)
+        return streaming_response(stream_rows(stmt, session_factory), order_summary_record, stream)
+    result = await db.execute(select(Order).where(*filters))
+    return result.scalars().all()
+
+@async_order_router.get("/batch", response_model=List[ReadOrder])
+async def get_orders_batch(ids: List[str] = Query(...), db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(
+        select(Order).options(selectinload(Order.items)).where(Order.id.in_(parse_order_ids(ids)))
+    )
+    return result.scalars().all()
+
+@async_order_router.get("/{order_id:uuid}", response_model=ReadOrder)
+async def get_order(order_id: UUID, db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(
+        select(Order).options(selectinload(Order.items)).where(Order.id == order_id)
+    )
+    db_order = result.scalars().first()
+    if db_order is None:
+        raise HTTPException(status_code=404, detail="Order not found")
+    return db_order
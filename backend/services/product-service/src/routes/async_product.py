@@ -0,0 +1,84 @@
+#routes/async_product.py
+# Async read handlers for /products, mounted ahead of routes/product.py when DB_ASYNC=1.
+# Writes are not overridden and fall through to the sync router. Id routes use the
+# uuid path convertor so they never shadow static sync paths.
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID
+from typing import Optional
+
+from database import get_async_db, get_async_primary_db
+from models.product import Product
+from http_cache import etag_matches, catalog_headers, not_modified
+from product_cache import product_cache
+from category_paths import in_category
+from routes.product import product_payload
+from pagination import ProductSort, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, paginate_products, build_product_page
+from schemas.product import ProductOut, ProductPage, PRODUCT_SUMMARY_COLUMNS
+
+async_product_router = APIRouter()
+
+async def fetch_product_page_async(db: AsyncSession, stmt, sort: ProductSort, limit: int, cursor: Optional[str]):
+    result = await db.execute(paginate_products(stmt, sort, limit, cursor))
+    page = build_product_page(result.all(), sort, limit)
+    return Response(orjson.dumps(page), media_type="application/json")
+
+@async_product_router.get("/", response_model=ProductPage)
+async def list_products(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    sort: ProductSort = ProductSort.id,
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await fetch_product_page_async(db, select(*PRODUCT_SUMMARY_COLUMNS), sort, limit, cursor)
+
+@async_product_router.get("/main/{main_category_id}", response_model=ProductPage)
+async def products_by_main(
+    main_category_id: UUID,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    sort: ProductSort = ProductSort.id,
+    db: AsyncSession = Depends(get_async_db),
+):
+    # Everything under a main category is one prefix scan of the category path index
+    stmt = select(*PRODUCT_SUMMARY_COLUMNS).where(in_category(main_category_id))
+    return await fetch_product_page_async(db, stmt, sort, limit, cursor)
+
+@async_product_router.get("/sub/{sub_category_id}", response_model=ProductPage)
+async def products_by_sub(
+    sub_category_id: UUID,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    sort: ProductSort = ProductSort.id,
+    db: AsyncSession = Depends(get_async_db),
+):
+    stmt = select(*PRODUCT_SUMMARY_COLUMNS).where(Product.sub_category_id == sub_category_id)
+    return await fetch_product_page_async(db, stmt, sort, limit, cursor)
+
+@async_product_router.get("/group/{group_id}", response_model=ProductPage)
+async def products_by_group(
+    group_id: UUID,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    sort: ProductSort = ProductSort.id,
+    db: AsyncSession = Depends(get_async_db),
+):
+    stmt = select(*PRODUCT_SUMMARY_COLUMNS).where(Product.sub_group_id == group_id)
+    return await fetch_product_page_async(db, stmt, sort, limit, cursor)
+
+@async_product_router.get("/{product_id:uuid}", response_model=ProductOut)
+async def get_one(product_id: UUID, request: Request, db: AsyncSession = Depends(get_async_primary_db)):
+    async def load():
+        db_prod = await db.get(Product, product_id)
+        return None if db_prod is None else product_payload(db_prod)
+
+    cached = await product_cache.get_or_load_async(product_id, load)
+    if cached is None:
+        raise HTTPException(status_code=404, detail="Product not found")
+    payload, etag = cached
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return Response(content=payload, media_type="application/json", headers=catalog_headers(etag))
@@ -1,13 +1,20 @@
 #routes/category.py
 
-from fastapi import APIRouter, Depends, HTTPException
+import json
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from schemas import category
 from uuid import UUID
 from sqlalchemy.orm import Session, joinedload
-from database import get_db
+from database import get_db, get_primary_db
 from models.category import MainCategory
 from models.subcategory import SubCategory
+from models.subgroup import SubGroup
 from typing import List
+from catalog_cache import category_tree_cache
+from category_delete import delete_category_now
+from product_cache import product_cache
+from category_paths import refresh_product_paths
+from http_cache import etag_matches, version_etag, catalog_headers, not_modified, table_version_stmt
 
 category_router = APIRouter()
 
@@ -18,12 +25,18 @@ def add_category(category: category.CreateCategory, db:Session = Depends(get_db)
         db.add(db_category)
         db.commit()
         db.refresh(db_category)
+        category_tree_cache.invalidate()
         return db_category
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
     
 @category_router.get("/", response_model=List[category.ReadCategory])
-def get_all_categories(db:Session = Depends(get_db)):
+def get_all_categories(request: Request, response: Response, db:Session = Depends(get_db)):
+    # The version is read before the rows, so a concurrent write can only make the ETag older than the body
+    etag = version_etag("categories", *db.execute(table_version_stmt(MainCategory)).one())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(catalog_headers(etag))
     return db.query(MainCategory).all()
 
 @category_router.put("/{category_id}", response_model=category.ReadCategory)
@@ -34,8 +47,11 @@ def update_category(category_id: UUID, category: category.CreateCategory, db:Ses
         raise HTTPException(status_code=404, detail="Category not found")
     if db_category.name is not None:
         db_category.name = category.name
+    product_ids = refresh_product_paths(db, MainCategory.id == category_id)
     db.commit()
     db.refresh(db_category)
+    product_cache.invalidate(*product_ids)
+    category_tree_cache.invalidate()
     return db_category
 
 @category_router.delete("/{category_id}", response_model=dict)
@@ -43,16 +59,26 @@ def delete_category(category_id: UUID, db: Session = Depends(get_db)):
     db_category = db.query(MainCategory).filter(category_id == MainCategory.id).first()
     if db_category is None:
         raise HTTPException(status_code=404, detail="Category not found")
-    db.delete(db_category)
-    db.commit()
+    delete_category_now(db, "main", db_category)
+    category_tree_cache.invalidate()
     return {"message": f"Category {category_id} deleted successfully"}
 
 @category_router.get("/tree", response_model=List[category.ReadFullNestedCategory])
-def get_full_category_tree(db: Session = Depends(get_db)):
+def get_full_category_tree(request: Request, db: Session = Depends(get_primary_db)):
+    payload, etag = category_tree_cache.get_or_build(
+        lambda: build_category_tree(db),
+        lambda: db.execute(table_version_stmt(MainCategory, SubCategory, SubGroup)).scalar(),
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return Response(content=payload, media_type="application/json", headers=catalog_headers(etag))
+
+def build_category_tree(db: Session) -> bytes:
     main_categories = db.query(MainCategory).options(
         joinedload(MainCategory.sub_categories).joinedload(SubCategory.sub_group)
     ).all()
-    return [category.ReadFullNestedCategory.model_validate(main) for main in main_categories]
+    tree = [category.ReadFullNestedCategory.model_validate(main).model_dump(mode="json") for main in main_categories]
+    return json.dumps(tree, separators=(",", ":")).encode()
 
     
 @category_router.get("/{category_id}", response_model=category.ReadCategory)
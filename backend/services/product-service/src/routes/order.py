@@ -1,77 +1,208 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+import os
+import uuid
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session, selectinload, sessionmaker
 from uuid import UUID
 from typing import List, Optional
-from database import get_db
+from database import get_db, get_session_factory
 from models.order import Order, OrderItem, OrderStatus
-from schemas.order import CreateOrder, ReadOrder, OrderSummary, UpdateOrderStatus
+from models.product import Product
+from schemas.order import (
+    CreateOrder, ReadOrder, OrderSummary, UpdateOrderStatus, ORDER_SUMMARY_COLUMNS, order_summary_record
+)
+from idempotency import request_fingerprint, find_replay, claim_key, store_response
+from analytics import OrderSales, SaleLine, record_status_change
+from jobs import enqueue
+from inventory import reserve_stock, release_stock, order_item_variants
+from streaming import StreamFormat, stream_rows, streaming_response
 
 order_router = APIRouter()
 
+ORDER_TAX_RATE = float(os.getenv("ORDER_TAX_RATE", "0.08"))
+ORDER_SHIPPING_COST = float(os.getenv("ORDER_SHIPPING_COST", "0"))
+
 @order_router.post("/create", response_model=ReadOrder)
-def create_order(order_data: CreateOrder, db: Session = Depends(get_db)):
+def create_order(
+    order_data: CreateOrder,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+    db: Session = Depends(get_db),
+):
+    if not order_data.items:
+        raise HTTPException(status_code=400, detail="Order must contain at least one item")
+
+    # Retries carrying the same Idempotency-Key get the stored response of the first success
+    fingerprint = None
+    if idempotency_key:
+        fingerprint = request_fingerprint(order_data.model_dump(mode="json"))
+        replay = find_replay(db, idempotency_key, fingerprint)
+        if replay is not None:
+            return replay
+
+    # Prices and names come from the catalog in one IN (...) query; client totals are ignored
+    product_ids = {item.productId for item in order_data.items}
+    products = {
+        row.id: row
+        for row in db.execute(
+            select(Product.id, Product.title, Product.price, Product.main_category_id).where(Product.id.in_(product_ids))
+        )
+    }
+    missing = product_ids - products.keys()
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Unknown products: {', '.join(sorted(map(str, missing)))}")
+
+    subtotal = round(sum(products[item.productId].price * item.quantity for item in order_data.items), 2)
+    tax = round(subtotal * ORDER_TAX_RATE, 2)
+    shipping = ORDER_SHIPPING_COST
+    total = round(subtotal + tax + shipping, 2)
+
     try:
-        # Step 1: Create and save the Order to generate an order_id
+        # The key is claimed first so a concurrent retry waits on it instead of ordering twice
+        if idempotency_key and not claim_key(db, idempotency_key, fingerprint):
+            db.rollback()
+            replay = find_replay(db, idempotency_key, fingerprint)
+            if replay is None:
+                raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is in progress")
+            return replay
+        # Stock is reserved first, then the order and items are written in the same
+        # transaction: flush the order, bulk insert every item, then commit once.
+        reserve_stock(db, ((item.productId, item.color, item.size, item.quantity) for item in order_data.items))
         db_order = Order(
-            customer=order_data.customer.model_dump(),  # Adjust based on your schema
-            subtotal=order_data.totals.subtotal,
-            tax=order_data.totals.tax,
-            shipping=order_data.totals.shipping,
-            total=order_data.totals.total,
+            id=uuid.uuid4(),
+            customer=order_data.customer.model_dump(),
+            subtotal=subtotal,
+            tax=tax,
+            shipping=shipping,
+            total=total,
             payment_method=order_data.paymentMethod,
             order_date=order_data.orderDate,
-            status="pending"  # Default status, adjust as needed
+            status=OrderStatus.pending
         )
         db.add(db_order)
-        db.commit()  # Save the order to the database to generate the ID
-        db.refresh(db_order)  # Refresh to get the generated ID
-
-        # Step 2: Create OrderItems with the generated order_id
-        for item in order_data.items:
-            db_item = OrderItem(
-                order_id=db_order.id,  # Link to the order using its ID
-                product_id=item.productId,
-                name=item.name,
-                price=item.price,
-                quantity=item.quantity,
-                color=item.color,
-                size=item.size,
-                image=item.image
-            )
-            db.add(db_item)
-
-        # Step 3: Commit the OrderItems
+        db.flush()
+        item_rows = [
+            {
+                "id": uuid.uuid4(),
+                "order_id": db_order.id,
+                "product_id": item.productId,
+                "name": products[item.productId].title,
+                "price": products[item.productId].price,
+                "quantity": item.quantity,
+                "color": item.color,
+                "size": item.size,
+                "image": item.image,
+                "main_category_id": products[item.productId].main_category_id,
+            }
+            for item in order_data.items
+        ]
+        db.execute(insert(OrderItem), item_rows)
+        # Built from the values just written, so returning the order costs no reload queries
+        response = ReadOrder(
+            id=db_order.id,
+            customer=order_data.customer,
+            subtotal=subtotal,
+            tax=tax,
+            shipping=shipping,
+            total=total,
+            payment_method=db_order.payment_method,
+            order_date=db_order.order_date,
+            status=db_order.status,
+            items=item_rows,
+        )
+        # Rollups are updated by a worker; the job commits or rolls back with the order
+        enqueue(db, "analytics.record_order", OrderSales(
+            day=order_data.orderDate.date(),
+            city=order_data.customer.city,
+            total=total,
+            lines=[
+                SaleLine(row["product_id"], row["name"], row["main_category_id"],
+                         row["quantity"], row["price"] * row["quantity"])
+                for row in item_rows
+            ],
+        ).to_payload())
+        if idempotency_key:
+            store_response(db, idempotency_key, 200, response.model_dump(mode="json"))
         db.commit()
+        return response
 
-        # Return the created order (adjust response as needed)
-        return db_order
-
+    except HTTPException:
+        db.rollback()  # Releases any stock reserved before the failure
+        raise
     except Exception as e:
-        db.rollback()  # Roll back the transaction if something goes wrong
+        db.rollback()  # Nothing is persisted if any insert fails
         raise HTTPException(status_code=500, detail=f"Failed to create order: {str(e)}")
 
-@order_router.get("/", response_model=List[OrderSummary])
-def get_orders(db: Session = Depends(get_db), status: Optional[OrderStatus] = None, area: Optional[str] = None):
-    query = db.query(Order)
+# Every filter maps to an indexed column on orders
+def order_filters(status=None, area=None, state=None, email=None, zip_code=None):
+    clauses = []
     if status:
-        query = query.filter(Order.status == status)
+        clauses.append(Order.status == status)
     if area:
-        query = query.filter(Order.customer.op('->>')('city') == area)
-    return query.all()
+        clauses.append(Order.customer_city == area)
+    if state:
+        clauses.append(Order.customer_state == state)
+    if email:
+        clauses.append(Order.customer_email == email)
+    if zip_code:
+        clauses.append(Order.customer_zip == zip_code)
+    return clauses
+
+@order_router.get("/", response_model=List[OrderSummary])
+def get_orders(
+    db: Session = Depends(get_db),
+    status: Optional[OrderStatus] = None,
+    area: Optional[str] = None,
+    state: Optional[str] = None,
+    email: Optional[str] = None,
+    zip_code: Optional[str] = None,
+    stream: Optional[StreamFormat] = None,
+    session_factory: sessionmaker = Depends(get_session_factory),
+):
+    filters = order_filters(status, area, state, email, zip_code)
+    if stream:
+        # Server-side cursor + NDJSON/chunked JSON: constant memory, first byte immediately
+        stmt = select(*ORDER_SUMMARY_COLUMNS).where(*filters)
+        return streaming_response(stream_rows(stmt, session_factory), order_summary_record, stream)
+    return db.query(Order).filter(*filters).all()
+
+MAX_BATCH_ORDERS = 200
+
+def parse_order_ids(ids: List[str]) -> List[UUID]:
+    # Accepts repeated ?ids=a&ids=b as well as ?ids=a,b
+    try:
+        parsed = list(dict.fromkeys(UUID(part) for value in ids for part in value.split(",") if part.strip()))
+    except ValueError:
+        raise HTTPException(status_code=422, detail="ids must be UUIDs")
+    if len(parsed) > MAX_BATCH_ORDERS:
+        raise HTTPException(status_code=422, detail=f"At most {MAX_BATCH_ORDERS} ids per request")
+    return parsed
+
+# Full orders for a list of ids in two queries: orders, then all their items via selectinload
+@order_router.get("/batch", response_model=List[ReadOrder])
+def get_orders_batch(ids: List[str] = Query(...), db: Session = Depends(get_db)):
+    order_ids = parse_order_ids(ids)
+    return db.query(Order).options(selectinload(Order.items)).filter(Order.id.in_(order_ids)).all()
 
 @order_router.get("/{order_id}", response_model=ReadOrder)
 def get_order(order_id: UUID, db: Session = Depends(get_db)):
-    db_order = db.query(Order).filter(Order.id == order_id).first()
+    db_order = db.query(Order).options(selectinload(Order.items)).filter(Order.id == order_id).first()
     if db_order is None:
         raise HTTPException(status_code=404, detail="Order not found")
     return db_order
 
 @order_router.put("/{order_id}/status", response_model=ReadOrder)
 def update_order_status(order_id: UUID, data: UpdateOrderStatus, db: Session = Depends(get_db)):
-    db_order = db.query(Order).filter(Order.id == order_id).first()
+    db_order = db.query(Order).options(selectinload(Order.items)).filter(Order.id == order_id).first()
     if db_order is None:
         raise HTTPException(status_code=404, detail="Order not found")
+    # Cancelling returns the items to stock; reopening a cancelled order reserves them again
+    if data.status == OrderStatus.cancelled and db_order.status != OrderStatus.cancelled:
+        release_stock(db, order_item_variants(db_order.items))
+    elif db_order.status == OrderStatus.cancelled and data.status != OrderStatus.cancelled:
+        reserve_stock(db, order_item_variants(db_order.items))
+    record_status_change(db, db_order, data.status)
     db_order.status = data.status
+    # Serialize before commit expires the instance, instead of refreshing and lazy-loading items
+    response = ReadOrder.model_validate(db_order)
     db.commit()
-    db.refresh(db_order)
-    return db_order
\ No newline at end of file
+    return response
\ No newline at end of file
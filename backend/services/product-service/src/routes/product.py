@@ -1,52 +1,136 @@
 #routes/product.py
 
 
-from fastapi import APIRouter, Depends, HTTPException
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from uuid import UUID
-from typing import List
+from typing import List, Optional
 
-from database import get_db
+from database import get_db, get_primary_db
 from models.product import Product
+from pagination import ProductSort, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, fetch_product_page
+from search_index import product_search_index
+from http_cache import etag_matches, version_etag, catalog_headers, not_modified
+from product_cache import product_cache
+from category_paths import CATEGORY_FIELDS, in_category, refresh_product_paths
 from schemas.product import (
-    ProductCreate, ProductUpdate, ProductOut, ProductSummary
+    ProductCreate, ProductUpdate, ProductOut, ProductPage, ProductSearchResult, PRODUCT_SUMMARY_COLUMNS
 )
 
 product_router = APIRouter()
 
+def product_payload(db_prod):
+    # (serialized ProductOut, ETag) as held by the product cache
+    payload = ProductOut.model_validate(db_prod).model_dump_json().encode()
+    return payload, version_etag(db_prod.id, db_prod.updated_at)
+
+def load_product_payload(db: Session, product_id: UUID):
+    db_prod = db.query(Product).filter(Product.id == product_id).first()
+    return None if db_prod is None else product_payload(db_prod)
+
 # Routes
 
 @product_router.post("/", response_model=ProductOut)
 def add_product(product: ProductCreate, db: Session = Depends(get_db)):
     db_product = Product(**product.model_dump())
     db.add(db_product)
+    db.flush()
+    refresh_product_paths(db, Product.id == db_product.id)
     db.commit()
     db.refresh(db_product)
+    product_search_index.index_product(db_product)
     return db_product
 
-@product_router.get("/", response_model=List[ProductSummary])
-def list_products(db: Session = Depends(get_db)):
-    return db.query(Product).all()
+@product_router.get("/", response_model=ProductPage)
+def list_products(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    sort: ProductSort = ProductSort.id,
+    db: Session = Depends(get_db),
+):
+    page = fetch_product_page(db, select(*PRODUCT_SUMMARY_COLUMNS), sort, limit, cursor)
+    return Response(orjson.dumps(page), media_type="application/json")
+
+@product_router.get("/main/{main_category_id}", response_model=ProductPage)
+def products_by_main(
+    main_category_id: UUID,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    sort: ProductSort = ProductSort.id,
+    db: Session = Depends(get_db),
+):
+    # Everything under a main category is one prefix scan of the category path index
+    stmt = select(*PRODUCT_SUMMARY_COLUMNS).where(in_category(main_category_id))
+    page = fetch_product_page(db, stmt, sort, limit, cursor)
+    return Response(orjson.dumps(page), media_type="application/json")
 
-@product_router.get("/main/{main_category_id}", response_model=List[ProductSummary])
-def products_by_main(main_category_id: UUID, db: Session = Depends(get_db)):
-    return db.query(Product).filter(Product.main_category_id == main_category_id).all()
+@product_router.get("/sub/{sub_category_id}", response_model=ProductPage)
+def products_by_sub(
+    sub_category_id: UUID,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    sort: ProductSort = ProductSort.id,
+    db: Session = Depends(get_db),
+):
+    stmt = select(*PRODUCT_SUMMARY_COLUMNS).where(Product.sub_category_id == sub_category_id)
+    page = fetch_product_page(db, stmt, sort, limit, cursor)
+    return Response(orjson.dumps(page), media_type="application/json")
 
-@product_router.get("/sub/{sub_category_id}", response_model=List[ProductSummary])
-def products_by_sub(sub_category_id: UUID, db: Session = Depends(get_db)):
-    return db.query(Product).filter(Product.sub_category_id == sub_category_id).all()
 
+@product_router.get("/group/{group_id}", response_model=ProductPage)
+def products_by_group(
+    group_id: UUID,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    sort: ProductSort = ProductSort.id,
+    db: Session = Depends(get_db),
+):
+    stmt = select(*PRODUCT_SUMMARY_COLUMNS).where(Product.sub_group_id == group_id)
+    page = fetch_product_page(db, stmt, sort, limit, cursor)
+    return Response(orjson.dumps(page), media_type="application/json")
 
-@product_router.get("/group/{group_id}", response_model=List[ProductSummary])
-def products_by_group(group_id: UUID, db: Session = Depends(get_db)):
-    return db.query(Product).filter(Product.sub_group_id == group_id).all()
+@product_router.get("/search", response_model=ProductSearchResult)
+def search_products(
+    q: Optional[str] = Query(None, max_length=200),
+    main_category_id: Optional[UUID] = None,
+    sub_category_id: Optional[UUID] = None,
+    sub_group_id: Optional[UUID] = None,
+    colors: List[str] = Query(default=[]),
+    sizes: List[float] = Query(default=[]),
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    facets: bool = False,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0, le=10000),
+):
+    # Text search and faceted browsing share this endpoint: without q the matching
+    # products are listed cheapest first. Facet counts (?facets=true) come from the in-memory index.
+    if not product_search_index.ready:
+        raise HTTPException(status_code=503, detail="Search index is still building")
+    filters = {
+        "main": [main_category_id] if main_category_id else [],
+        "sub": [sub_category_id] if sub_category_id else [],
+        "group": [sub_group_id] if sub_group_id else [],
+        "color": [color.lower() for color in colors],
+        "size": sizes,
+    }
+    items, total, facet_counts = product_search_index.search(
+        q, filters, limit, offset, min_price=min_price, max_price=max_price, with_facets=facets
+    )
+    return {"items": items, "total": total, "facets": facet_counts}
 
+# Cache fills read from the primary so a lagging replica cannot repopulate an invalidated entry
 @product_router.get("/{product_id}", response_model=ProductOut)
-def get_one(product_id: UUID, db: Session = Depends(get_db)):
-    db_prod = db.query(Product).filter(Product.id == product_id).first()
-    if db_prod is None:
+def get_one(product_id: UUID, request: Request, db: Session = Depends(get_primary_db)):
+    cached = product_cache.get_or_load(product_id, lambda: load_product_payload(db, product_id))
+    if cached is None:
         raise HTTPException(status_code=404, detail="Product not found")
-    return db_prod
+    payload, etag = cached
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return Response(content=payload, media_type="application/json", headers=catalog_headers(etag))
 
 @product_router.put("/{product_id}", response_model=ProductOut)
 def update_one(product_id: UUID, data: ProductUpdate, db: Session = Depends(get_db)):
@@ -56,8 +140,12 @@ def update_one(product_id: UUID, data: ProductUpdate, db: Session = Depends(get_
     updates = data.model_dump(exclude_unset=True)
     for field, value in updates.items():
         setattr(db_prod, field, value)
+    if updates.keys() & CATEGORY_FIELDS:
+        refresh_product_paths(db, Product.id == product_id)
     db.commit()
     db.refresh(db_prod)
+    product_cache.invalidate(product_id)
+    product_search_index.index_product(db_prod)
     return db_prod
 
 @product_router.delete("/{product_id}", response_model=dict)
@@ -67,4 +155,6 @@ def delete_one(product_id: UUID, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Product not found")
     db.delete(db_prod)
     db.commit()
+    product_cache.invalidate(product_id)
+    product_search_index.remove_product(product_id)
     return {"message": "Product deleted successfully"}
\ No newline at end of file
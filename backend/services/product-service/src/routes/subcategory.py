@@ -1,18 +1,27 @@
 #routes/subcategory.py
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from schemas.subcategory import ReadSubCategory, CreateSubCategory
 from uuid import UUID
 from sqlalchemy.orm import Session
 from database import get_db
 from typing import List
+from catalog_cache import category_tree_cache
+from product_cache import product_cache
+from category_delete import delete_category_now
+from category_paths import refresh_product_paths
+from http_cache import etag_matches, version_etag, catalog_headers, not_modified, table_version_stmt
 from sqlalchemy.exc import NoResultFound
 from models.subcategory import SubCategory
 
 subcategory_router = APIRouter()
 
 @subcategory_router.get("/", response_model=List[ReadSubCategory])
-def get_subcategory(db:Session = Depends(get_db)):
+def get_subcategory(request: Request, response: Response, db:Session = Depends(get_db)):
+    etag = version_etag("subcategories", *db.execute(table_version_stmt(SubCategory)).one())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(catalog_headers(etag))
     return db.query(SubCategory).all()
 
 @subcategory_router.get("/{subcategory_id}", response_model=ReadSubCategory)
@@ -33,6 +42,7 @@ def add_subcategory(subcategory: CreateSubCategory, db:Session = Depends(get_db)
         db.add(db_subcategory)
         db.commit()
         db.refresh(db_subcategory)
+        category_tree_cache.invalidate()
         return db_subcategory
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -47,8 +57,11 @@ def add_subcategory(subcategory_id: UUID, subcategory: CreateSubCategory, db:Ses
             db_subcategory.main_category_id = subcategory.main_category_id
         if subcategory.main_category_id is not None:
             db_subcategory.main_category_id = subcategory.main_category_id
+        product_ids = refresh_product_paths(db, SubCategory.id == subcategory_id)
         db.commit()
         db.refresh(db_subcategory)
+        product_cache.invalidate(*product_ids)
+        category_tree_cache.invalidate()
         return db_subcategory
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -60,8 +73,10 @@ def delete_sub_category(sub_category_id: UUID, db: Session = Depends(get_db)):
         db_subcategory = db.query(SubCategory).filter(SubCategory.id == sub_category_id).first()
         if db_subcategory is None:
             raise NoResultFound("No subcategory with that id exists.")
-        db.delete(db_subcategory)
-        db.commit()
+        delete_category_now(db, "sub", db_subcategory)
+        category_tree_cache.invalidate()
         return {"message": f"SubCategory {sub_category_id} deleted successfully"}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
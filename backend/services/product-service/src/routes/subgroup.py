@@ -1,18 +1,27 @@
 #routes/subgroup.py
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from schemas.subgroup import ReadSubGroup, CreateSubGroup
 from uuid import UUID
 from sqlalchemy.orm import Session
 from database import get_db
 from typing import List
+from catalog_cache import category_tree_cache
+from product_cache import product_cache
+from category_delete import delete_category_now
+from category_paths import refresh_product_paths
+from http_cache import etag_matches, version_etag, catalog_headers, not_modified, table_version_stmt
 from sqlalchemy.exc import NoResultFound
 from models.subgroup import SubGroup
 
 subgroup_router = APIRouter()
 
 @subgroup_router.get("/", response_model=List[ReadSubGroup])
-def get_subgroup(db:Session = Depends(get_db)):
+def get_subgroup(request: Request, response: Response, db:Session = Depends(get_db)):
+    etag = version_etag("subgroups", *db.execute(table_version_stmt(SubGroup)).one())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(catalog_headers(etag))
     return db.query(SubGroup).all()
 
 @subgroup_router.get("/{subgroup_id}", response_model=ReadSubGroup)
@@ -32,6 +41,7 @@ def add_subgroup(subgroup: CreateSubGroup, db:Session = Depends(get_db)):
         db.add(db_subgroup)
         db.commit()
         db.refresh(db_subgroup)
+        category_tree_cache.invalidate()
         return db_subgroup
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -46,8 +56,11 @@ def add_subgroup(subgroup_id: UUID, subgroup: CreateSubGroup, db:Session = Depen
             db_subgroup.name = subgroup.name
         if subgroup.sub_category_id is not None:
             db_subgroup.sub_category_id = subgroup.sub_category_id
+        product_ids = refresh_product_paths(db, SubGroup.id == subgroup_id)
         db.commit()
         db.refresh(db_subgroup)
+        product_cache.invalidate(*product_ids)
+        category_tree_cache.invalidate()
         return db_subgroup
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -59,8 +72,10 @@ def delete_subgroup(subgroup_id: UUID, db: Session = Depends(get_db)):
         db_subgroup = db.query(SubGroup).filter(SubGroup.id == subgroup_id).first()
         if db_subgroup is None:
             raise HTTPException(status_code=404, detail="Subcategory not found")
-        db.delete(db_subgroup)
-        db.commit()
+        delete_category_now(db, "group", db_subgroup)
+        category_tree_cache.invalidate()
         return {"message": f"SubCategory {subgroup_id} deleted successfully"}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
@@ -1,5 +1,5 @@
 # schemas/admin.py
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from uuid import UUID
 
 class AdminLogin(BaseModel):
@@ -13,6 +13,4 @@ class AdminCreate(BaseModel):
 class AdminRead(BaseModel):
     id: UUID
     email: str
-
-    class Config:
-        orm_mode = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
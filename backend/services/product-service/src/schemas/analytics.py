@@ -0,0 +1,32 @@
+# schemas/analytics.py
+from pydantic import BaseModel
+from typing import Optional
+from uuid import UUID
+from datetime import date
+from models.order import OrderStatus
+
+class DailyRevenue(BaseModel):
+    day: date
+    orders: int
+    revenue: float
+
+class StatusTotal(BaseModel):
+    status: OrderStatus
+    orders: int
+
+class ProductTotal(BaseModel):
+    product_id: UUID
+    name: str
+    units: int
+    revenue: float
+
+class CityTotal(BaseModel):
+    city: str
+    orders: int
+    revenue: float
+
+class CategoryTotal(BaseModel):
+    main_category_id: UUID
+    name: Optional[str]  # None once the category has been deleted
+    units: int
+    revenue: float
@@ -0,0 +1,13 @@
+# schemas/inventory.py
+from pydantic import BaseModel, ConfigDict, Field
+from uuid import UUID
+
+
+class InventoryLevel(BaseModel):
+    color: str
+    size: float
+    quantity: int = Field(ge=0)
+
+class InventoryRead(InventoryLevel):
+    product_id: UUID
+    model_config = ConfigDict(from_attributes=True)
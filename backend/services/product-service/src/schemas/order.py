@@ -1,8 +1,8 @@
-from pydantic import BaseModel, ConfigDict
-from typing import List
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
-from models.order import OrderStatus
+from models.order import Order, OrderStatus
 
 
 class CustomerInfo(BaseModel):
@@ -19,8 +19,8 @@ class CustomerInfo(BaseModel):
 class OrderItemCreate(BaseModel):
     productId: UUID
     name: str
-    price: float
-    quantity: int
+    price: float  # informational only, the catalog price is charged
+    quantity: int = Field(gt=0)
     color: str
     size: float
     image: str
@@ -34,7 +34,7 @@ class Totals(BaseModel):
 class CreateOrder(BaseModel):
     customer: CustomerInfo
     items: List[OrderItemCreate]
-    totals: Totals
+    totals: Optional[Totals] = None  # recomputed server-side, accepted for older clients
     paymentMethod: str
     orderDate: datetime
 
@@ -69,5 +69,17 @@ class OrderSummary(BaseModel):
     status: OrderStatus
     model_config = ConfigDict(from_attributes=True)
 
+# Columns and record shape of OrderSummary for the streaming endpoints, which
+# skip model validation and serialize rows directly.
+ORDER_SUMMARY_COLUMNS = (Order.id, Order.order_date, Order.total, Order.status)
+
+def order_summary_record(row) -> dict:
+    return {
+        "id": str(row.id),
+        "order_date": row.order_date.isoformat(),
+        "total": row.total,
+        "status": row.status.value,
+    }
+
 class UpdateOrderStatus(BaseModel):
     status: OrderStatus
\ No newline at end of file
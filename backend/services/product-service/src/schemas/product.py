@@ -1,8 +1,9 @@
 #schemas/product.py
 
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional, Union
 from uuid import UUID
+from models.product import Product
 
 class ProductBase(BaseModel):
     title: str
@@ -29,10 +30,14 @@ class ProductUpdate(BaseModel):
     sizes: Optional[List[float]]
     assets: Optional[List[str]]
 
+class CategoryCrumb(BaseModel):
+    id: UUID
+    name: str
+
 class ProductOut(ProductBase):
     id: UUID
-    class Config:
-        orm_mode = True
+    breadcrumb: Optional[List[CategoryCrumb]] = None
+    model_config = ConfigDict(from_attributes=True)
 
 class ProductSummary(BaseModel):
     id: UUID
@@ -41,5 +46,81 @@ class ProductSummary(BaseModel):
     colors: List[str]
     sizes: List[float]
     assets: List[str]
-    class Config:
-        orm_mode = True
\ No newline at end of file
+    breadcrumb: Optional[List[CategoryCrumb]] = None
+    model_config = ConfigDict(from_attributes=True)
+
+# Columns of ProductSummary, in field order. List pages select these as plain rows
+# and encode them directly with orjson, skipping entity loading and model validation.
+PRODUCT_SUMMARY_COLUMNS = (
+    Product.id, Product.title, Product.price, Product.colors, Product.sizes, Product.assets, Product.breadcrumb
+)
+
+class ProductPage(BaseModel):
+    items: List[ProductSummary]
+    next_cursor: Optional[str] = None
+    limit: int
+
+class FacetCount(BaseModel):
+    value: Union[str, float]
+    count: int
+
+class PriceBucket(BaseModel):
+    min: float
+    max: Optional[float]  # None for the open-ended top bucket
+    count: int
+
+class ProductFacets(BaseModel):
+    colors: List[FacetCount]
+    sizes: List[FacetCount]
+    price: List[PriceBucket]
+
+class ProductSearchResult(BaseModel):
+    items: List[ProductSummary]
+    total: int
+    facets: Optional[ProductFacets] = None
+
+class ProductImportError(BaseModel):
+    row: int
+    error: Union[str, list]
+
+class ProductImportResult(BaseModel):
+    inserted: int
+    failed: int
+    errors: List[ProductImportError]
+    errors_truncated: bool
+
+class ProductBatchFilter(BaseModel):
+    # Criteria are AND-ed; the category fields select a subtree
+    ids: Optional[List[UUID]] = None
+    main_category_id: Optional[UUID] = None
+    sub_category_id: Optional[UUID] = None
+    sub_group_id: Optional[UUID] = None
+
+class ProductBatchChanges(BaseModel):
+    price: Optional[float] = Field(None, gt=0)
+    price_multiplier: Optional[float] = Field(None, gt=0)  # e.g. 0.8 for a 20% markdown
+    colors: Optional[List[str]] = None
+    sizes: Optional[List[float]] = None
+    assets: Optional[List[str]] = None
+
+class ProductBatchItem(ProductBatchChanges):
+    id: UUID
+
+class ProductBatchUpdate(BaseModel):
+    # Either the same changes for every product matching filter, or explicit per-product items
+    filter: Optional[ProductBatchFilter] = None
+    changes: Optional[ProductBatchChanges] = None
+    items: Optional[List[ProductBatchItem]] = None
+
+class ProductBatchDelete(BaseModel):
+    filter: ProductBatchFilter
+
+class ProductBatchItemResult(BaseModel):
+    id: UUID
+    status: str  # "updated", "deleted", "not_found", "unchanged" or "referenced_by_orders"
+
+class ProductBatchResult(BaseModel):
+    matched: int
+    affected: int
+    failed: int
+    results: List[ProductBatchItemResult]
@@ -0,0 +1,505 @@
+#search_index.py
+
+import bisect
+import heapq
+import logging
+import math
+import os
+import re
+import threading
+from collections import Counter, defaultdict, namedtuple
+from datetime import timedelta
+from functools import partial
+
+from sqlalchemy import func, select
+
+from http_cache import table_version_stmt
+from models.product import Product
+from models.product_tombstone import ProductTombstone
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+TITLE_WEIGHT = 3.0
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Score multipliers for non-exact term matches
+PREFIX_PENALTY = 0.7
+FUZZY_PENALTY = 0.5
+MIN_PREFIX_LENGTH = 2
+MIN_FUZZY_LENGTH = 4
+MAX_EXPANSIONS = 50
+# Upper bounds of the price facet buckets; the last bucket is open-ended
+PRICE_BUCKETS = (25, 50, 100, 150, 200, 300, 500)
+FACET_FIELDS = ("color", "size")
+# How often each worker applies the products changed elsewhere
+SEARCH_INDEX_SYNC_SECONDS = float(os.getenv("SEARCH_INDEX_SYNC_SECONDS", "30"))
+# updated_at is stamped at transaction start, so each sync reads this far back past
+# the previous one to catch transactions that started before it and committed after
+SEARCH_INDEX_SYNC_OVERLAP_SECONDS = float(os.getenv("SEARCH_INDEX_SYNC_OVERLAP_SECONDS", "120"))
+# Tombstones are purged after this long (worker.py); an index last synced earlier is rebuilt
+SEARCH_INDEX_TOMBSTONE_RETENTION_SECONDS = float(os.getenv("SEARCH_INDEX_TOMBSTONE_RETENTION_SECONDS", "86400"))
+
+# The product fields the index reads, detached from any session
+IndexedProduct = namedtuple("IndexedProduct", (
+    "id", "title", "description", "price", "main_category_id", "sub_category_id", "sub_group_id",
+    "colors", "sizes", "assets",
+))
+
+
+_INDEXED_COLUMNS = [getattr(Product, field) for field in IndexedProduct._fields]
+
+
+def snapshot(product) -> IndexedProduct:
+    return IndexedProduct(*(getattr(product, field) for field in IndexedProduct._fields))
+
+
+def _consistent_session(session_factory):
+    # Every read of one build or sync sees the same snapshot of the database
+    db = session_factory()
+    db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    return db
+
+
+def purge_tombstones(db, older_than_seconds: float = SEARCH_INDEX_TOMBSTONE_RETENTION_SECONDS) -> int:
+    result = db.execute(
+        ProductTombstone.__table__.delete().where(
+            ProductTombstone.deleted_at < func.now() - timedelta(seconds=older_than_seconds)
+        )
+    )
+    db.commit()
+    return result.rowcount
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+def _deletes(term):
+    # Single-character deletions; two terms sharing one are within ~1 edit of each other
+    variants = {term}
+    if len(term) >= MIN_FUZZY_LENGTH:
+        variants.update(term[:i] + term[i + 1:] for i in range(len(term)))
+    return variants
+
+
+class ProductSearchIndex:
+    # In-memory inverted index over product title and description, so queries
+    # never touch the database. Each worker process holds its own copy: writes
+    # made through this worker are applied at once by index_product/remove_product,
+    # and writes made anywhere else (other workers, the job worker, SQL) are picked
+    # up by sync(), which applies the rows changed and the tombstones recorded since
+    # the previous sync. Other workers' writes therefore show up within
+    # SEARCH_INDEX_SYNC_SECONDS. rebuild() reads the whole table, on cold start only.
+
+    _STATE = (
+        "_docs", "_postings", "_doc_len", "_total_len", "_vocab", "_variants",
+        "_filters", "_field_values", "_prices", "_price_keys", "_price_ids",
+    )
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._rebuild_lock = threading.Lock()
+        self._stop = threading.Event()
+        self.ready = False
+        self.version = None
+        self.synced_at = None
+        self._touched = None
+        self._removed_categories = None
+        self._reset()
+
+    def _reset(self):
+        self._docs = {}                     # product id -> (summary dict, terms, filter keys)
+        self._postings = defaultdict(dict)  # term -> {product id: weighted term frequency}
+        self._doc_len = {}
+        self._total_len = 0.0
+        self._vocab = []                    # sorted terms, for prefix expansion
+        self._variants = defaultdict(set)   # deletion variant -> terms, for typo tolerance
+        self._filters = defaultdict(set)    # (field, value) -> product ids
+        self._field_values = defaultdict(set)  # field -> values present in _filters
+        self._prices = {}                   # product id -> price
+        self._price_keys = []               # prices in ascending order ...
+        self._price_ids = []                # ... and the product id at each position
+
+    # Maintenance
+
+    def _track_local_writes(self):
+        with self._lock:
+            self._touched = {}
+            self._removed_categories = []
+
+    def _replay_local_writes(self, target):
+        # Writes made through this worker while a build or sync was reading are newer than what it read
+        for field, category_id in self._removed_categories:
+            target._remove_category(field, category_id)
+        for product_id, product in self._touched.items():
+            target._remove(product_id)
+            if product is not None:
+                target._add(product)
+
+    def _stop_tracking(self):
+        with self._lock:
+            self._touched = None
+            self._removed_categories = None
+
+    def rebuild(self, session_factory, batch_size: int = 1000):
+        # Builds a fresh index off to the side and swaps it in, so the current one
+        # keeps serving meanwhile. Terms and prices are appended and sorted once at
+        # the end; keeping them sorted row by row made a rebuild quadratic.
+        with self._rebuild_lock:
+            self._track_local_writes()
+            try:
+                fresh = ProductSearchIndex()
+                db = _consistent_session(session_factory)
+                try:
+                    version = db.execute(table_version_stmt(Product)).scalar()
+                    synced_at = db.execute(select(func.now())).scalar()
+                    rows = db.execute(select(*_INDEXED_COLUMNS).execution_options(yield_per=batch_size))
+                    for row in rows:
+                        fresh._add(row, bulk=True)
+                finally:
+                    db.close()
+                fresh._sort()
+                with self._lock:
+                    self._replay_local_writes(fresh)
+                    for name in self._STATE:
+                        setattr(self, name, getattr(fresh, name))
+                    self.version = version
+                    self.synced_at = synced_at
+                    self.ready = True
+            finally:
+                self._stop_tracking()
+
+    def sync(self, session_factory):
+        # Applies the products written since the last build or sync, here or elsewhere:
+        # the tombstones of deleted ones, then the rows whose updated_at falls in the
+        # window. Both are read from one snapshot, so a product deleted and imported
+        # again in the window ends up indexed. Nothing is read past the version check
+        # while the products table is unchanged.
+        with self._rebuild_lock:
+            self._track_local_writes()
+            try:
+                db = _consistent_session(session_factory)
+                try:
+                    version = db.execute(table_version_stmt(Product)).scalar()
+                    if version == self.version:
+                        return
+                    synced_at = db.execute(select(func.now())).scalar()
+                    lagging = (synced_at - self.synced_at).total_seconds() > SEARCH_INDEX_TOMBSTONE_RETENTION_SECONDS
+                    if not lagging:
+                        since = self.synced_at - timedelta(seconds=SEARCH_INDEX_SYNC_OVERLAP_SECONDS)
+                        changed = db.execute(select(*_INDEXED_COLUMNS).where(Product.updated_at > since)).all()
+                        deleted = db.execute(
+                            select(ProductTombstone.product_id).where(ProductTombstone.deleted_at > since)
+                        ).scalars().all()
+                finally:
+                    db.close()
+                if not lagging:
+                    with self._lock:
+                        for product_id in deleted:
+                            self._remove(product_id)
+                        for row in changed:
+                            self._remove(row.id)
+                            self._add(row)
+                        self._replay_local_writes(self)
+                        self.version = version
+                        self.synced_at = synced_at
+            finally:
+                self._stop_tracking()
+        if lagging:
+            # Tombstones of the window may already be purged
+            self.rebuild(session_factory)
+
+    def run(self, session_factory, interval: float = SEARCH_INDEX_SYNC_SECONDS):
+        # Background loop for each API worker: the initial build, then periodic syncs
+        self._stop.clear()
+        while not self._stop.is_set():
+            try:
+                if self.ready:
+                    self.sync(session_factory)
+                else:
+                    self.rebuild(session_factory)
+            except Exception:
+                logger.exception("search index refresh failed")
+            self._stop.wait(interval)
+
+    def stop(self):
+        self._stop.set()
+
+    def index_product(self, product):
+        product = snapshot(product)
+        with self._lock:
+            if self._touched is not None:
+                self._touched[product.id] = product
+            self._remove(product.id)
+            self._add(product)
+
+    def remove_product(self, product_id):
+        with self._lock:
+            if self._touched is not None:
+                self._touched[product_id] = None
+            self._remove(product_id)
+
+    def remove_category(self, field: str, category_id):
+        # Drops every product under a deleted main category ("main"), subcategory ("sub") or subgroup ("group")
+        with self._lock:
+            if self._removed_categories is not None:
+                self._removed_categories.append((field, category_id))
+            self._remove_category(field, category_id)
+
+    def _remove_category(self, field: str, category_id):
+        for product_id in list(self._filters.get((field, category_id), ())):
+            self._remove(product_id)
+
+    def _sort(self):
+        self._vocab.sort()
+        order = sorted(range(len(self._price_keys)), key=self._price_keys.__getitem__)
+        self._price_keys = [self._price_keys[i] for i in order]
+        self._price_ids = [self._price_ids[i] for i in order]
+
+    def _add(self, product, bulk: bool = False):
+        # bulk appends to the sorted lists and leaves ordering to _sort()
+        weights = defaultdict(float)
+        for term in tokenize(product.title):
+            weights[term] += TITLE_WEIGHT
+        for term in tokenize(product.description):
+            weights[term] += 1.0
+
+        for term, weight in weights.items():
+            postings = self._postings[term]
+            if not postings:
+                if bulk:
+                    self._vocab.append(term)
+                else:
+                    bisect.insort(self._vocab, term)
+                for variant in _deletes(term):
+                    self._variants[variant].add(term)
+            postings[product.id] = weight
+
+        filter_keys = [
+            ("main", product.main_category_id),
+            ("sub", product.sub_category_id),
+            ("group", product.sub_group_id),
+        ]
+        filter_keys += [("color", color.lower()) for color in product.colors or []]
+        filter_keys += [("size", float(size)) for size in product.sizes or []]
+        for key in filter_keys:
+            self._filters[key].add(product.id)
+            self._field_values[key[0]].add(key[1])
+
+        if bulk:
+            self._price_keys.append(product.price)
+            self._price_ids.append(product.id)
+        else:
+            position = bisect.bisect_right(self._price_keys, product.price)
+            self._price_keys.insert(position, product.price)
+            self._price_ids.insert(position, product.id)
+        self._prices[product.id] = product.price
+
+        length = sum(weights.values())
+        self._doc_len[product.id] = length
+        self._total_len += length
+        summary = {
+            "id": product.id,
+            "title": product.title,
+            "price": product.price,
+            "colors": list(product.colors or []),
+            "sizes": list(product.sizes or []),
+            "assets": list(product.assets or []),
+        }
+        self._docs[product.id] = (summary, list(weights), filter_keys)
+
+    def _remove(self, product_id):
+        doc = self._docs.pop(product_id, None)
+        if doc is None:
+            return
+        _, terms, filter_keys = doc
+        for term in terms:
+            postings = self._postings[term]
+            postings.pop(product_id, None)
+            if not postings:
+                del self._postings[term]
+                del self._vocab[bisect.bisect_left(self._vocab, term)]
+                for variant in _deletes(term):
+                    self._variants[variant].discard(term)
+                    if not self._variants[variant]:
+                        del self._variants[variant]
+        for key in filter_keys:
+            ids = self._filters.get(key)
+            if ids is not None:
+                ids.discard(product_id)
+                if not ids:
+                    del self._filters[key]
+                    self._field_values[key[0]].discard(key[1])
+
+        price = self._prices.pop(product_id)
+        lo = bisect.bisect_left(self._price_keys, price)
+        hi = bisect.bisect_right(self._price_keys, price)
+        position = lo + self._price_ids[lo:hi].index(product_id)
+        del self._price_keys[position]
+        del self._price_ids[position]
+        self._total_len -= self._doc_len.pop(product_id)
+
+    # Queries
+
+    def _expand(self, token):
+        # Returns {term: multiplier}, preferring exact > prefix > fuzzy matches
+        expansions = {}
+        if len(token) >= MIN_PREFIX_LENGTH:
+            start = bisect.bisect_left(self._vocab, token)
+            for term in self._vocab[start:start + MAX_EXPANSIONS]:
+                if not term.startswith(token):
+                    break
+                expansions[term] = 1.0 if term == token else PREFIX_PENALTY
+        elif token in self._postings:
+            expansions[token] = 1.0
+        if len(token) >= MIN_FUZZY_LENGTH:
+            for variant in _deletes(token):
+                for term in self._variants.get(variant, ()):
+                    expansions.setdefault(term, FUZZY_PENALTY)
+        return expansions
+
+    def _field_ids(self, field, values):
+        # Values within one field are OR-ed
+        if not values:
+            return None
+        return set().union(*(self._filters.get((field, value), ()) for value in values))
+
+    def _price_range_ids(self, min_price, max_price):
+        if min_price is None and max_price is None:
+            return None
+        lo = 0 if min_price is None else bisect.bisect_left(self._price_keys, min_price)
+        hi = len(self._price_keys) if max_price is None else bisect.bisect_right(self._price_keys, max_price)
+        return set(self._price_ids[lo:hi])
+
+    def _text_ids(self, expanded):
+        # Products matching every query token through at least one of its expansions
+        result = None
+        for expansions in expanded:
+            ids = set().union(*(self._postings[term].keys() for term in expansions))
+            result = ids if result is None else result & ids
+        return result
+
+    @staticmethod
+    def _intersect(*id_sets):
+        # None means "no constraint"; returns None only if nothing constrains the result
+        present = sorted((ids for ids in id_sets if ids is not None), key=len)
+        if not present:
+            return None
+        return present[0].intersection(*present[1:])
+
+    def _score(self, expanded, allowed):
+        n_docs = len(self._docs) or 1
+        avg_len = (self._total_len / n_docs) or 1.0
+        scores = dict.fromkeys(allowed, 0.0)
+        for expansions in expanded:
+            best = {}
+            for term, multiplier in expansions.items():
+                postings = self._postings[term]
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                if len(allowed) < len(postings):
+                    pairs = ((pid, postings[pid]) for pid in allowed if pid in postings)
+                else:
+                    pairs = ((pid, tf) for pid, tf in postings.items() if pid in allowed)
+                for product_id, tf in pairs:
+                    norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * self._doc_len[product_id] / avg_len)
+                    score = multiplier * idf * tf * (BM25_K1 + 1) / norm
+                    if score > best.get(product_id, 0.0):
+                        best[product_id] = score
+            for product_id, score in best.items():
+                scores[product_id] += score
+        return scores
+
+    def _by_price(self, ids, count):
+        # Cheapest first. Dense result sets walk the price order, sparse ones are sorted directly.
+        if ids is None:
+            return self._price_ids[:count]
+        if len(ids) * 8 >= len(self._price_ids):
+            ordered = []
+            for product_id in self._price_ids:
+                if product_id in ids:
+                    ordered.append(product_id)
+                    if len(ordered) == count:
+                        break
+            return ordered
+        return heapq.nsmallest(count, ids, key=self._prices.__getitem__)
+
+    def _value_counts(self, field, base):
+        counts = []
+        for value in self._field_values.get(field, ()):
+            ids = self._filters[(field, value)]
+            count = len(ids) if base is None else len(base & ids)
+            if count:
+                counts.append({"value": value, "count": count})
+        counts.sort(key=lambda facet: (-facet["count"], facet["value"]))
+        return counts
+
+    def _all_price_counts(self) -> list:
+        # Over the whole catalog the buckets are boundaries in the sorted price list
+        edges = [0] + [bisect.bisect_left(self._price_keys, bound) for bound in PRICE_BUCKETS]
+        edges.append(len(self._price_keys))
+        return [edges[i + 1] - edges[i] for i in range(len(edges) - 1)]
+
+    @staticmethod
+    def _subset_price_counts(prices: dict, base) -> list:
+        # Runs without the index lock: prices is the dict captured under it, and a
+        # product removed meanwhile is simply not counted
+        bucket_of = partial(bisect.bisect_right, PRICE_BUCKETS)
+        counts = Counter(bucket_of(price) for price in map(prices.get, base) if price is not None)
+        return [counts[i] for i in range(len(PRICE_BUCKETS) + 1)]
+
+    @staticmethod
+    def _price_buckets(counts) -> list:
+        bounds = (0,) + PRICE_BUCKETS + (None,)
+        return [
+            {"min": bounds[i], "max": bounds[i + 1], "count": count}
+            for i, count in enumerate(counts)
+            if count
+        ]
+
+    def _facets(self, text_ids, field_ids, price_ids):
+        # Disjunctive facets: each field is counted with every constraint except its own,
+        # so selecting "red" still shows how many products are blue. The price facet
+        # is returned as the id set to count, or None for every product.
+        facets = {}
+        for field in FACET_FIELDS:
+            others = [ids for name, ids in field_ids.items() if name != field]
+            facets[field + "s"] = self._value_counts(field, self._intersect(text_ids, price_ids, *others))
+        return facets, self._intersect(text_ids, *field_ids.values())
+
+    def search(self, query, filters: dict, limit: int, offset: int = 0,
+               min_price: float = None, max_price: float = None, with_facets: bool = False):
+        # Ranks by relevance when there is a text query, otherwise by price.
+        # Returns (summaries, total matches, facets or None).
+        with self._lock:
+            tokens = tokenize(query)
+            expanded = [self._expand(token) for token in tokens]
+            text_ids = self._text_ids(expanded) if tokens else None
+            field_ids = {field: self._field_ids(field, values) for field, values in filters.items()}
+            price_ids = self._price_range_ids(min_price, max_price)
+            result = self._intersect(text_ids, price_ids, *field_ids.values())
+
+            total = len(self._docs) if result is None else len(result)
+            if tokens:
+                scores = self._score(expanded, result)
+                top = heapq.nlargest(offset + limit, scores.items(), key=lambda item: item[1])
+                page = [product_id for product_id, _ in top[offset:]]
+            else:
+                page = self._by_price(result, offset + limit)[offset:]
+
+            items = [self._docs[product_id][0] for product_id in page]
+            if not with_facets:
+                return items, total, None
+            facets, price_base = self._facets(text_ids, field_ids, price_ids)
+            if price_base is None:
+                price_counts = self._all_price_counts()
+            else:
+                prices = self._prices
+        if price_base is not None:
+            price_counts = self._subset_price_counts(prices, price_base)
+        facets["price"] = self._price_buckets(price_counts)
+        return items, total, facets
+
+
+product_search_index = ProductSearchIndex()
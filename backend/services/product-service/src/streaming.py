@@ -0,0 +1,83 @@
+#streaming.py
+
+import json
+from enum import Enum
+
+from fastapi.responses import StreamingResponse
+
+STREAM_BATCH_SIZE = 1000
+# Serialized rows are coalesced into chunks of about this size before being sent
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+class StreamFormat(str, Enum):
+    ndjson = "ndjson"
+    json = "json"
+
+
+MEDIA_TYPES = {
+    StreamFormat.ndjson: "application/x-ndjson",
+    StreamFormat.json: "application/json",
+}
+
+
+# Runs stmt on a dedicated session with a server-side cursor and yields results
+# batch by batch, so memory stays flat however many rows match. The request's
+# own session may already be closed while a StreamingResponse is still sending.
+# session_factory comes from database.get_session_factory, so GET streams are
+# routed to a replica like any other read.
+def stream_scalars(stmt, session_factory, batch_size: int = STREAM_BATCH_SIZE):
+    db = session_factory()
+    try:
+        yield from db.execute(stmt.execution_options(yield_per=batch_size)).scalars()
+    finally:
+        db.close()
+
+
+# Same as stream_scalars but yields Row tuples, for column-only selects
+def stream_rows(stmt, session_factory, batch_size: int = STREAM_BATCH_SIZE):
+    db = session_factory()
+    try:
+        yield from db.execute(stmt.execution_options(yield_per=batch_size))
+    finally:
+        db.close()
+
+
+def streaming_response(items, serialize, fmt: StreamFormat):
+    return StreamingResponse(encode_stream(items, serialize, fmt), media_type=MEDIA_TYPES[fmt])
+
+
+def _dumps(obj) -> str:
+    return json.dumps(obj, default=str, separators=(",", ":"))
+
+
+def ndjson_lines(items, serialize):
+    for item in items:
+        yield _dumps(serialize(item)) + "\n"
+
+
+def json_array_chunks(items, serialize):
+    yield "["
+    first = True
+    for item in items:
+        yield ("" if first else ",") + _dumps(serialize(item))
+        first = False
+    yield "]"
+
+
+def coalesce(pieces, chunk_size: int = STREAM_CHUNK_BYTES):
+    buffer, size = [], 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield "".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def encode_stream(items, serialize, fmt: StreamFormat):
+    if fmt == StreamFormat.ndjson:
+        return coalesce(ndjson_lines(items, serialize))
+    return coalesce(json_array_chunks(items, serialize))
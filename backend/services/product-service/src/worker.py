@@ -0,0 +1,84 @@
+#worker.py
+# Background job worker, run separately from the API and scaled on its own:
+#
+#     cd src && python worker.py --batch-size 20
+#
+# Any number of workers can run against the same database; jobs are claimed
+# with FOR UPDATE SKIP LOCKED so each runs on one worker at a time.
+
+import argparse
+import logging
+import os
+import signal
+import time
+
+from db.session import SessionLocal
+from http_cache import compact_catalog_changes
+from idempotency import purge_expired_keys
+from jobs import run_once, purge_done
+from search_index import purge_tombstones
+import analytics  # noqa: F401  (registers job handlers)
+import category_delete  # noqa: F401
+
+JOB_POLL_INTERVAL_SECONDS = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "1"))
+JOB_RETENTION_DAYS = float(os.getenv("JOB_RETENTION_DAYS", "7"))
+PURGE_INTERVAL_SECONDS = 3600
+# Every catalog version read counts the change log rows not yet compacted
+CATALOG_COMPACT_INTERVAL_SECONDS = float(os.getenv("CATALOG_COMPACT_INTERVAL_SECONDS", "60"))
+
+# Housekeeping: (what, fn(db) -> rows removed, interval in seconds)
+PURGES = [
+    ("finished jobs", lambda db: purge_done(db, JOB_RETENTION_DAYS), PURGE_INTERVAL_SECONDS),
+    ("product tombstones", purge_tombstones, PURGE_INTERVAL_SECONDS),
+    ("expired idempotency keys", purge_expired_keys, PURGE_INTERVAL_SECONDS),
+    ("catalog change log rows", compact_catalog_changes, CATALOG_COMPACT_INTERVAL_SECONDS),
+]
+
+logger = logging.getLogger("worker")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run background jobs from the jobs table")
+    parser.add_argument("--batch-size", type=int, default=10)
+    parser.add_argument("--poll-interval", type=float, default=JOB_POLL_INTERVAL_SECONDS)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True  # finish the current batch, then exit
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    last_purge = dict.fromkeys((what for what, _, _ in PURGES), 0.0)
+    logger.info("worker started")
+    while not stopping:
+        for what, purge, interval in PURGES:
+            if time.monotonic() - last_purge[what] <= interval:
+                continue
+            db = SessionLocal()
+            try:
+                purged = purge(db)
+                if purged:
+                    logger.info("purged %d %s", purged, what)
+            except Exception:
+                logger.exception("purging %s failed", what)
+            finally:
+                db.close()
+            last_purge[what] = time.monotonic()
+        try:
+            claimed = run_once(SessionLocal, args.batch_size)
+        except Exception:
+            logger.exception("job batch failed")
+            claimed = 0
+        # Keep draining while there is work; only sleep once the queue is empty
+        if not claimed:
+            time.sleep(args.poll_interval)
+    logger.info("worker stopped")
+
+
+if __name__ == "__main__":
+    main()
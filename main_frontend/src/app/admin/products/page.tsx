@@ -45,19 +45,28 @@ export default function ProductsPage() {
   const fetchProducts = async () => {
     try {
       setLoading(true)
-      const response = await fetch("http://localhost:8000/admin/products", {
-        headers: {
-          Authorization: `Bearer ${token}`,
-          accept: "application/json",
-        },
-      })
+      const allProducts: AdminProduct[] = []
+      let cursor: string | null = null
+      do {
+        const url = new URL("http://localhost:8000/admin/products")
+        url.searchParams.set("limit", "200")
+        if (cursor) url.searchParams.set("cursor", cursor)
+        const response = await fetch(url, {
+          headers: {
+            Authorization: `Bearer ${token}`,
+            accept: "application/json",
+          },
+        })
 
-      if (!response.ok) {
-        throw new Error("Failed to fetch products")
-      }
+        if (!response.ok) {
+          throw new Error("Failed to fetch products")
+        }
 
-      const data = await response.json()
-      setProducts(data)
+        const data = await response.json()
+        allProducts.push(...data.items)
+        cursor = data.next_cursor
+      } while (cursor)
+      setProducts(allProducts)
       setError(null)
     } catch (error) {
       setError(error instanceof Error ? error.message : "Failed to fetch products")
@@ -29,7 +29,7 @@ export default function NewArrivals() {
         if (response.ok) {
           const data = await response.json()
           // Simulate new arrivals by taking last 8 products
-          const arrivals = data.slice(-8).reverse()
+          const arrivals = data.items.slice(-8).reverse()
           setNewArrivals(arrivals)
         }
       } catch (error) {
@@ -6,6 +6,7 @@ export const API_CONFIG = {
     PRODUCTS_BY_SUB: "/products/sub",
     PRODUCTS_BY_GROUP: "/products/group",
     PRODUCT_BY_ID: "/products",
+    PRODUCT_SEARCH: "/products/search",
   },
 } as const
 
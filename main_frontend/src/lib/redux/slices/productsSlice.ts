@@ -37,7 +37,7 @@ export const fetchProductsByMain = createAsyncThunk(
       }
 
       const data = await response.json()
-      return { products: data as Product[], categoryId }
+      return { products: data.items as Product[], categoryId }
     } catch (error) {
       return rejectWithValue(error instanceof Error ? error.message : "Failed to fetch products")
     }
@@ -60,7 +60,7 @@ export const fetchProductsBySub = createAsyncThunk(
       }
 
       const data = await response.json()
-      return { products: data as Product[], subcategoryId }
+      return { products: data.items as Product[], subcategoryId }
     } catch (error) {
       return rejectWithValue(error instanceof Error ? error.message : "Failed to fetch products")
     }
@@ -83,7 +83,7 @@ export const fetchProductsByGroup = createAsyncThunk(
       }
 
       const data = await response.json()
-      return { products: data as Product[], groupId }
+      return { products: data.items as Product[], groupId }
     } catch (error) {
       return rejectWithValue(error instanceof Error ? error.message : "Failed to fetch products")
     }
@@ -39,38 +39,24 @@ const initialState: SearchState = {
 // Async thunk for searching products
 export const searchProducts = createAsyncThunk("search/searchProducts", async (query: string, { rejectWithValue }) => {
   try {
-    // Since there's no specific search endpoint, we'll fetch from all main categories
-    const categoryIds = [
-      "80e5a0ee-6fa7-429c-a299-019d38514e1d", // Men
-      "e04a81b1-9653-47f1-93da-9e14340c564d", // Women
-      "a454b1f9-b5b1-4e78-8d75-2ab7a7624873", // Kids
-    ]
-
-    const allProducts: Product[] = []
-
-    // Fetch products from all categories
-    for (const categoryId of categoryIds) {
-      try {
-        const response = await fetch(getApiUrl("PRODUCTS_BY_MAIN", categoryId), {
-          method: "GET",
-          headers: {
-            accept: "application/json",
-          },
-        })
-
-        if (response.ok) {
-          const data = await response.json()
-          allProducts.push(...data)
-        }
-      } catch (error) {
-        console.error(`Failed to fetch products from category ${categoryId}:`, error)
-      }
+    const url = new URL(getApiUrl("PRODUCT_SEARCH"))
+    url.searchParams.set("q", query)
+    url.searchParams.set("limit", "200")
+    const response = await fetch(url, {
+      method: "GET",
+      headers: {
+        accept: "application/json",
+      },
+    })
+
+    if (!response.ok) {
+      throw new Error(`HTTP error! status: ${response.status}`)
     }
 
-    // Filter products based on search query
-    const searchResults = allProducts.filter((product) => product.title.toLowerCase().includes(query.toLowerCase()))
+    const data = await response.json()
+    const searchResults: Product[] = data.items
 
-    return { products: allProducts, searchResults, query }
+    return { products: searchResults, searchResults, query }
   } catch (error) {
     return rejectWithValue(error instanceof Error ? error.message : "Failed to search products")
   }